@@ -113,6 +113,21 @@ strict_help = "Enable strict mode. This will cause MkDocs to abort the build on
 theme_help = "The theme to use when building your documentation."
 theme_choices = sorted(utils.get_theme_names())
 site_dir_help = "The directory to output the result of the documentation build."
+jobs_help = (
+    "The number of worker processes to render pages and templates with, and of threads to copy "
+    "static files with (default: 1)."
+)
+atomic_help = (
+    "Build the site in a staging directory and swap it into place of the site_dir "
+    "only when the build succeeds. The swap is atomic on Linux or if the site_dir is a "
+    "symlink. Can't be combined with --dirty."
+)
+profile_help = "Report how long each phase of the build and the slowest pages took."
+profile_file_help = (
+    "Also write the timings to this file in the Trace Event Format, which can be opened in "
+    "Chrome's about:tracing or in Perfetto. Implies --profile."
+)
+plugin_stats_help = "Report the time spent in the event handlers of each plugin."
 use_directory_urls_help = "Use directory URLs when building pages (the default)."
 reload_help = "Enable the live reloading in the development server (this is the default)"
 no_reload_help = "Disable the live reloading in the development server."
@@ -272,18 +287,42 @@ def serve_command(**kwargs):
 @click.option('-c', '--clean/--dirty', is_flag=True, default=True, help=clean_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, help=jobs_help)
+@click.option('--atomic', is_flag=True, help=atomic_help)
+@click.option('--profile', is_flag=True, help=profile_help)
+@click.option('--profile-file', type=click.Path(dir_okay=False), help=profile_file_help)
+@click.option('--plugin-stats', is_flag=True, help=plugin_stats_help)
 @common_options
-def build_command(clean, **kwargs):
+def build_command(clean, jobs, atomic, profile, profile_file, plugin_stats, **kwargs):
     """Build the MkDocs documentation."""
     from mkdocs.commands import build
+    from mkdocs.utils.profiling import Profiler
+
+    if atomic and not clean:
+        raise click.BadOptionUsage('atomic', "--atomic can't be combined with --dirty.")
 
     _enable_warnings()
     cfg = config.load_config(**kwargs)
+    if plugin_stats:
+        cfg.plugins.enable_stats()
     cfg.plugins.on_startup(command='build', dirty=not clean)
+    profiler = Profiler() if profile or profile_file else None
     try:
-        build.build(cfg, dirty=not clean)
+        build.build(cfg, dirty=not clean, jobs=jobs, atomic=atomic, profiler=profiler)
     finally:
         cfg.plugins.on_shutdown()
+    # The new site is already in place, but don't leave the previous one behind.
+    build.wait_for_cleanup()
+
+    # Report through the build logger: under `python -m mkdocs` this module's logger is
+    # '__main__', which is outside the 'mkdocs' hierarchy and has no handler.
+    if profiler is not None:
+        build.log.info(f"Build profile:\n{profiler.format_report()}")
+        if profile_file:
+            profiler.write_trace(profile_file)
+            build.log.info(f"Build profile written to: {profile_file}")
+    if plugin_stats:
+        build.log.info(f"Time spent in plugin events:\n{cfg.plugins.format_stats()}")
 
 
 @cli.command(name="gh-deploy")
@@ -297,9 +336,19 @@ def build_command(clean, **kwargs):
 @click.option('--shell', is_flag=True, help=shell_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, help=jobs_help)
 @common_options
 def gh_deploy_command(
-    clean, message, remote_branch, remote_name, force, no_history, ignore_version, shell, **kwargs
+    clean,
+    message,
+    remote_branch,
+    remote_name,
+    force,
+    no_history,
+    ignore_version,
+    shell,
+    jobs,
+    **kwargs,
 ):
     """Deploy your documentation to GitHub Pages."""
     from mkdocs.commands import build, gh_deploy
@@ -308,7 +357,7 @@ def gh_deploy_command(
     cfg = config.load_config(remote_branch=remote_branch, remote_name=remote_name, **kwargs)
     cfg.plugins.on_startup(command='gh-deploy', dirty=not clean)
     try:
-        build.build(cfg, dirty=not clean)
+        build.build(cfg, dirty=not clean, jobs=jobs)
     finally:
         cfg.plugins.on_shutdown()
     gh_deploy.gh_deploy(
@@ -1,30 +1,67 @@
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import ctypes
+import errno
+import functools
 import gzip
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
+import pickle
+import posixpath
+import re
+import secrets
+import shutil
+import sys
+import tempfile
+import threading
 import time
-from typing import TYPE_CHECKING, Sequence
+import types
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import urljoin, urlsplit
 
 import jinja2
+import jinja2.meta
 from jinja2.exceptions import TemplateNotFound
 
 import mkdocs
 from mkdocs import utils
 from mkdocs.exceptions import Abort, BuildError
+from mkdocs.plugins import BasePlugin
 from mkdocs.structure.files import File, Files, InclusionLevel, get_files, set_exclusions
 from mkdocs.structure.nav import Navigation, get_navigation
 from mkdocs.structure.pages import Page
+from mkdocs.theme import Theme
 from mkdocs.utils import DuplicateFilter  # noqa: F401 - legacy re-export
 from mkdocs.utils import templates
+from mkdocs.utils.profiling import Profiler
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.plugins import EventStats, PluginCollection
 
 
 log = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 def get_context(
     nav: Navigation,
@@ -34,28 +71,95 @@ def get_context(
     base_url: str = '',
 ) -> templates.TemplateContext:
     """Return the template context for a given page or template."""
-    if page is not None:
-        base_url = utils.get_relative_url('.', page.url)
+    return _ContextFactory.get(nav, files, config).get_context(page, base_url)
+
+
+class _ContextFactory:
+    """
+    Creates the template contexts of one build.
+
+    The parts that are the same for all pages are computed once, and the URLs of
+    `extra_css` and `extra_javascript` once for all pages that are at the same depth.
+    """
+
+    _last: _ContextFactory | None = None
+    """The factory of the current build, it's discarded when `build` finishes."""
+
+    @classmethod
+    def get(
+        cls, nav: Navigation, files: Sequence[File] | Files, config: MkDocsConfig
+    ) -> _ContextFactory:
+        """Return the factory of the previous call if it was for the same build."""
+        last = cls._last
+        if (
+            last is None
+            or last.nav is not nav
+            or last.files is not files
+            or last.config is not config
+        ):
+            last = cls._last = cls(nav, files, config)
+        return last
+
+    def __init__(
+        self, nav: Navigation, files: Sequence[File] | Files, config: MkDocsConfig
+    ) -> None:
+        self.nav = nav
+        self.files = files
+        self.config = config
+        self.pages = files.documentation_pages() if isinstance(files, Files) else files
+        self.build_date_utc = utils.get_build_datetime()
+        self._extra_css: list[str] = []
+        self._extra_javascript: list = []
+        self._extra_urls: dict[tuple[str, str | None], tuple[list[str], list[str]]] = {}
+        self._extra_tops: set[str] = set()
+
+    def get_context(
+        self, page: Page | None = None, base_url: str = ''
+    ) -> templates.TemplateContext:
+        """Return the template context for a given page or template."""
+        if page is not None:
+            base_url = utils.get_relative_url('.', page.url)
+        extra_css, extra_javascript = self._get_extra_urls(page, base_url)
+
+        return templates.TemplateContext(
+            nav=self.nav,
+            pages=self.pages,
+            base_url=base_url,
+            # Copies, as plugins may modify them for one page (`on_page_context`).
+            extra_css=list(extra_css),
+            extra_javascript=list(extra_javascript),
+            mkdocs_version=mkdocs.__version__,
+            build_date_utc=self.build_date_utc,
+            config=self.config,
+            page=page,
+        )
 
-    extra_javascript = [
-        utils.normalize_url(str(script), page, base_url) for script in config.extra_javascript
-    ]
-    extra_css = [utils.normalize_url(path, page, base_url) for path in config.extra_css]
-
-    if isinstance(files, Files):
-        files = files.documentation_pages()
-
-    return templates.TemplateContext(
-        nav=nav,
-        pages=files,
-        base_url=base_url,
-        extra_css=extra_css,
-        extra_javascript=extra_javascript,
-        mkdocs_version=mkdocs.__version__,
-        build_date_utc=utils.get_build_datetime(),
-        config=config,
-        page=page,
-    )
+    def _get_extra_urls(self, page: Page | None, base_url: str) -> tuple[list[str], list[str]]:
+        config = self.config
+        if config.extra_css != self._extra_css or config.extra_javascript != self._extra_javascript:
+            self._extra_css = list(config.extra_css)
+            self._extra_javascript = list(config.extra_javascript)
+            self._extra_urls.clear()
+            # The first directory of each relative URL.
+            self._extra_tops = {
+                posixpath.normpath('/' + str(path)).lstrip('/').partition('/')[0]
+                for path in self._extra_css + self._extra_javascript
+            }
+
+        # A URL relative to a page only depends on the page's depth (`base_url`), unless
+        # the page is in the same directory tree as the URL's target.
+        key: tuple[str, str | None] | None = None
+        if page is not None:
+            key = (base_url, page.url if page.url.partition('/')[0] in self._extra_tops else None)
+            if key in self._extra_urls:
+                return self._extra_urls[key]
+        urls = (
+            [utils.normalize_url(path, page, base_url) for path in self._extra_css],
+            [utils.normalize_url(str(path), page, base_url) for path in self._extra_javascript],
+        )
+        if key is not None:
+            self._extra_urls[key] = urls
+        return urls
 
 
 def _build_template(
@@ -89,24 +193,32 @@ def _build_template(
 
 
 def _build_theme_template(
-    template_name: str, env: jinja2.Environment, files: Files, config: MkDocsConfig, nav: Navigation
-) -> None:
-    """Build a template using the theme environment."""
+    template_name: str,
+    env: jinja2.Environment,
+    files: Files,
+    config: MkDocsConfig,
+    nav: Navigation,
+    *,
+    skip_unchanged: bool = False,
+) -> bool:
+    """Build a template using the theme environment. Returns whether the output file was written."""
     log.debug(f"Building theme template: {template_name}")
 
     try:
         template = env.get_template(template_name)
     except TemplateNotFound:
         log.warning(f"Template skipped: '{template_name}' not found in theme directories.")
-        return
+        return False
 
     output = _build_template(template_name, template, files, config, nav)
 
     if output.strip():
         output_path = os.path.join(config.site_dir, template_name)
-        utils.write_file(output.encode('utf-8'), output_path)
+        written = utils.write_file(
+            output.encode('utf-8'), output_path, skip_unchanged=skip_unchanged
+        )
 
-        if template_name == 'sitemap.xml':
+        if template_name == 'sitemap.xml' and (written or not os.path.isfile(f'{output_path}.gz')):
             log.debug(f"Gzipping template: {template_name}")
             gz_filename = f'{output_path}.gz'
             with open(gz_filename, 'wb') as f:
@@ -117,31 +229,50 @@ def _build_theme_template(
                     fileobj=f, filename=gz_filename, mode='wb', mtime=timestamp
                 ) as gz_buf:
                     gz_buf.write(output.encode('utf-8'))
+        return written
     else:
         log.info(f"Template skipped: '{template_name}' generated empty output.")
+        return False
 
 
-def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig, nav: Navigation):
-    """Build user templates which are not part of the theme."""
+def _build_extra_template(
+    template_name: str,
+    files: Files,
+    config: MkDocsConfig,
+    nav: Navigation,
+    *,
+    skip_unchanged: bool = False,
+) -> bool:
+    """Build user templates which are not part of the theme. Returns whether the output file was written."""
     log.debug(f"Building extra template: {template_name}")
 
     file = files.get_file_from_path(template_name)
     if file is None:
         log.warning(f"Template skipped: '{template_name}' not found in docs_dir.")
-        return
+        return False
 
     try:
         template = jinja2.Template(file.content_string)
     except Exception as e:
         log.warning(f"Error reading template '{template_name}': {e}")
-        return
+        return False
 
     output = _build_template(template_name, template, files, config, nav)
 
     if output.strip():
-        utils.write_file(output.encode('utf-8'), file.abs_dest_path)
+        return utils.write_file(
+            output.encode('utf-8'), file.abs_dest_path, skip_unchanged=skip_unchanged
+        )
     else:
         log.info(f"Template skipped: '{template_name}' generated empty output.")
+        return False
+
+
+def _log_page_error(message: str, e: Exception) -> None:
+    # Prevent duplicated the error message because it will be printed immediately afterwards.
+    if not isinstance(e, BuildError):
+        message += f" {e}"
+    log.error(message)
 
 
 def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool = False) -> None:
@@ -156,32 +287,32 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
         # Run the `pre_page` plugin event
         page = config.plugins.on_pre_page(page, config=config, files=files)
 
-        page.read_source(config)
-        assert page.markdown is not None
-
-        # Run `page_markdown` plugin events.
-        page.markdown = config.plugins.on_page_markdown(
-            page.markdown, page=page, config=config, files=files
-        )
-
-        page.render(config, files)
-        assert page.content is not None
-
-        # Run `page_content` plugin events.
-        page.content = config.plugins.on_page_content(
-            page.content, page=page, config=config, files=files
-        )
+        _read_and_render_page(page, config, files)
     except Exception as e:
-        message = f"Error reading page '{page.file.src_uri}':"
-        # Prevent duplicated the error message because it will be printed immediately afterwards.
-        if not isinstance(e, BuildError):
-            message += f" {e}"
-        log.error(message)
+        _log_page_error(f"Error reading page '{page.file.src_uri}':", e)
         raise
     finally:
         config._current_page = None
 
 
+def _read_and_render_page(page: Page, config: MkDocsConfig, files: Files) -> None:
+    page.read_source(config)
+    assert page.markdown is not None
+
+    # Run `page_markdown` plugin events.
+    page.markdown = config.plugins.on_page_markdown(
+        page.markdown, page=page, config=config, files=files
+    )
+
+    page.render(config, files)
+    assert page.content is not None
+
+    # Run `page_content` plugin events.
+    page.content = config.plugins.on_page_content(
+        page.content, page=page, config=config, files=files
+    )
+
+
 def _build_page(
     page: Page,
     config: MkDocsConfig,
@@ -190,14 +321,20 @@ def _build_page(
     env: jinja2.Environment,
     dirty: bool = False,
     excluded: bool = False,
-) -> None:
-    """Pass a Page to theme template and write output to site_dir."""
+    *,
+    skip_unchanged: bool = False,
+) -> bool:
+    """
+    Pass a Page to theme template and write output to site_dir.
+
+    Returns whether the output file was written.
+    """
     config._current_page = page
     try:
         # When --dirty is used, only build the page if the file has been modified since the
         # previous build of the output.
         if dirty and not page.file.is_modified():
-            return
+            return False
 
         log.debug(f"Building page {page.file.src_uri}")
 
@@ -227,18 +364,17 @@ def _build_page(
 
         # Write the output file.
         if output.strip():
-            utils.write_file(
-                output.encode('utf-8', errors='xmlcharrefreplace'), page.file.abs_dest_path
+            return utils.write_file(
+                output.encode('utf-8', errors='xmlcharrefreplace'),
+                page.file.abs_dest_path,
+                skip_unchanged=skip_unchanged,
             )
         else:
             log.info(f"Page skipped: '{page.file.src_uri}'. Generated empty output.")
+            return False
 
     except Exception as e:
-        message = f"Error building page '{page.file.src_uri}':"
-        # Prevent duplicated the error message because it will be printed immediately afterwards.
-        if not isinstance(e, BuildError):
-            message += f" {e}"
-        log.error(message)
+        _log_page_error(f"Error building page '{page.file.src_uri}':", e)
         raise
     finally:
         # Deactivate page
@@ -246,8 +382,553 @@ def _build_page(
         config._current_page = None
 
 
-def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = False) -> None:
-    """Perform a full site build."""
+def _run_page_context_event(
+    page: Page, config: MkDocsConfig, doc_files: Sequence[File], nav: Navigation
+) -> None:
+    """Run only the `page_context` event for a page whose output is unchanged."""
+    # Plugins such as search collect what they need from every page in this event.
+    config._current_page = page
+    page.active = True
+    try:
+        context = get_context(nav, doc_files, config, page)
+        config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+    except Exception as e:
+        _log_page_error(f"Error building page '{page.file.src_uri}':", e)
+        raise
+    finally:
+        page.active = False
+        config._current_page = None
+
+
+# Events that run in worker processes when pages are rendered in parallel.
+_PARALLEL_PAGE_EVENTS = ('page_read_source', 'page_markdown', 'page_content')
+# Plugins handling these events may have added filters and globals that are used by the templates.
+_PARALLEL_TEMPLATE_EVENTS = ('env',)
+
+
+def _get_parallel_unsafe_plugins(config: MkDocsConfig, events: Sequence[str]) -> list[str]:
+    """Return names of plugins that handle any of `events` but don't declare `supports_parallel_rendering`."""
+    plugins = config.plugins
+    unsafe: dict[str, None] = {}
+    for event_name in events:
+        for method in plugins.events[event_name]:
+            name = plugins._event_origins.get(method, '<unknown>')
+            plugin = plugins.get(name)
+            if not getattr(plugin, 'supports_parallel_rendering', False):
+                unsafe[name] = None
+    return list(unsafe)
+
+
+def _can_render_in_parallel(config: MkDocsConfig, events: Sequence[str]) -> bool:
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        log.info(
+            "Rendering pages serially because this platform doesn't support forking processes."
+        )
+        return False
+    if unsafe := _get_parallel_unsafe_plugins(config, events):
+        log.info(
+            "Rendering pages serially because these plugins don't declare "
+            f"`supports_parallel_rendering`: {', '.join(unsafe)}"
+        )
+        return False
+    return True
+
+
+# Inherited by the forked worker processes, see `_process_pool`.
+_worker_context: dict[str, Any] = {}
+_worker_log_handler = utils.CaptureHandler()
+
+
+def _init_worker() -> None:
+    # Collect log messages instead of emitting them, the main process will replay them in order.
+    logger = logging.getLogger('mkdocs')
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.addHandler(_worker_log_handler)
+    logger.propagate = False
+    # Only send the plugin stats that are recorded in the worker to the main process.
+    plugins: PluginCollection = _worker_context['plugins']
+    if plugins.stats is not None:
+        plugins.stats = {}
+
+
+@contextlib.contextmanager
+def _process_pool(
+    jobs: int, state: Any, plugins: PluginCollection
+) -> Iterator[concurrent.futures.ProcessPoolExecutor]:
+    """A pool of forked worker processes, which get a copy of `state` (and everything else)."""
+    _worker_context['state'] = state
+    _worker_context['plugins'] = plugins
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+        ) as pool:
+            yield pool
+    finally:
+        del _worker_context['state']
+        del _worker_context['plugins']
+
+
+_WorkerResult = Tuple[T, List[logging.LogRecord], Optional[Exception]]
+# The start and end (`time.perf_counter()`) and the process ID of a call in a worker.
+_Timing = Tuple[float, float, int]
+
+
+def _call_timed(
+    fn: Callable[[int], _WorkerResult[T]], index: int
+) -> tuple[_WorkerResult[T], _Timing, dict[tuple[str, str], EventStats] | None]:
+    """Call `fn(index)` in a worker, also returning its timing and the plugin stats it recorded."""
+    plugins: PluginCollection = _worker_context['plugins']
+    start = time.perf_counter()
+    result = fn(index)
+    timing = (start, time.perf_counter(), os.getpid())
+    stats = plugins.stats
+    if stats is not None:
+        plugins.stats = {}
+    return result, timing, stats
+
+
+def _map_in_order(
+    pool: concurrent.futures.Executor, fn: Callable[[int], _WorkerResult[T]], count: int, jobs: int
+) -> Iterator[tuple[T, _Timing, list[logging.LogRecord]]]:
+    """Run `fn(i)` for each index in the pool; replay the logs and re-raise errors in the original order."""
+    chunksize = max(1, count // (jobs * 4))
+    timed_fn = functools.partial(_call_timed, fn)
+    results = pool.map(timed_fn, range(count), chunksize=chunksize)
+    for (result, records, error), timing, stats in results:
+        if stats:
+            _worker_context['plugins'].add_stats(stats)
+        utils.replay_log_records(records)
+        if error is not None:
+            raise error
+        yield result, timing, records
+
+
+def _get_page_state(page: Page) -> dict[str, Any]:
+    """The attributes of a page that are populated by `_read_and_render_page`."""
+    state: dict[str, Any] = {
+        'markdown': page.markdown,
+        'meta': page.meta,
+        'content': page.content,
+        'toc': page.toc,
+        '_title_from_render': page._title_from_render,
+        'present_anchor_ids': page.present_anchor_ids,
+        # File objects can't be sent to another process as-is, they are looked up again by `src_uri`.
+        'links_to_anchors': page.links_to_anchors
+        and {f.src_uri: links for f, links in page.links_to_anchors.items()},
+        '_link_targets': page._link_targets,
+    }
+    if 'title' in page.__dict__:
+        state['title'] = page.__dict__['title']
+    return state
+
+
+def _set_page_state(page: Page, state: dict[str, Any], files: Files) -> None:
+    for key, value in state.items():
+        if key == 'links_to_anchors' and value:
+            value = {files.src_uris[src_uri]: links for src_uri, links in value.items()}
+        setattr(page, key, value)
+
+
+def _populate_page_in_worker(index: int) -> _WorkerResult[dict[str, Any] | None]:
+    config, files, pages = _worker_context['state']
+    page = pages[index]
+    config._current_page = page
+    try:
+        _read_and_render_page(page, config, files)
+    except Exception as e:
+        _log_page_error(f"Error reading page '{page.file.src_uri}':", e)
+        return None, _worker_log_handler.pop_records(), e
+    finally:
+        config._current_page = None
+    return _get_page_state(page), _worker_log_handler.pop_records(), None
+
+
+def _populate_pages_in_parallel(
+    pages: list[Page],
+    config: MkDocsConfig,
+    files: Files,
+    jobs: int,
+    *,
+    profiler: Profiler,
+    build_state: _BuildState | None = None,
+) -> None:
+    """
+    Same as calling `_populate_page` for each page, but Markdown is rendered by a process pool.
+
+    The messages that were logged for each page are recorded into `build_state`.
+    """
+    # Run the `pre_page` plugin events in the main process, before the workers get forked.
+    for i, page in enumerate(pages):
+        config._current_page = page
+        try:
+            pages[i] = config.plugins.on_pre_page(page, config=config, files=files)
+        except Exception as e:
+            _log_page_error(f"Error reading page '{page.file.src_uri}':", e)
+            raise
+        finally:
+            config._current_page = None
+
+    with _process_pool(jobs, (config, files, pages), config.plugins) as pool:
+        states = _map_in_order(pool, _populate_page_in_worker, len(pages), jobs)
+        for page, (state, timing, records) in zip(pages, states):
+            assert state is not None
+            _set_page_state(page, state, files)
+            profiler.add_step(page.file.src_uri, 'markdown', *timing)
+            if build_state is not None:
+                build_state.record_logs(page, records)
+
+
+def _render_page_in_worker(index: int) -> _WorkerResult[str | None]:
+    config, env, prepared = _worker_context['state']
+    page, template_name, context = prepared[index]
+    config._current_page = page
+    page.active = True
+    try:
+        output = env.get_template(template_name).render(context)
+    except Exception as e:
+        _log_page_error(f"Error building page '{page.file.src_uri}':", e)
+        return None, _worker_log_handler.pop_records(), e
+    finally:
+        page.active = False
+        config._current_page = None
+    return output, _worker_log_handler.pop_records(), None
+
+
+def _build_pages_in_parallel(
+    build_files: Sequence[File],
+    doc_files: Sequence[File],
+    config: MkDocsConfig,
+    nav: Navigation,
+    env: jinja2.Environment,
+    dirty: bool,
+    jobs: int,
+    *,
+    skip_unchanged: bool = False,
+    unchanged: Collection[str] = (),
+    profiler: Profiler,
+) -> int:
+    """
+    Same as calling `_build_page` for each page in `build_files`, but templates are rendered by a
+    process pool and the output files are written by a thread pool.
+
+    Only the `page_context` event is run for the pages in `unchanged` (by `src_uri`).
+    Returns the number of output files that were written.
+    """
+    # Collect the contexts in the main process first, `page_context` events are run in order.
+    prepared: list[tuple[Page, str, templates.TemplateContext]] = []
+    for file in build_files:
+        page = file.page
+        assert page is not None
+        if file.src_uri in unchanged:
+            _run_page_context_event(page, config, doc_files, nav)
+            continue
+        if dirty and not page.file.is_modified():
+            continue
+        config._current_page = page
+        try:
+            log.debug(f"Building page {page.file.src_uri}")
+            page.active = True
+            context = get_context(nav, doc_files, config, page)
+            template_name = page.meta.get('template', 'main.html')
+            # Fail early if the template doesn't exist.
+            env.get_template(template_name)
+            context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+            if file.inclusion.is_excluded():
+                page.content = (
+                    '<div class="mkdocs-draft-marker" title="This page will not be included into the built site.">'
+                    'DRAFT'
+                    '</div>' + (page.content or '')
+                )
+        except Exception as e:
+            _log_page_error(f"Error building page '{page.file.src_uri}':", e)
+            raise
+        finally:
+            page.active = False
+            config._current_page = None
+        prepared.append((page, template_name, context))
+
+    with _process_pool(jobs, (config, env, prepared), config.plugins) as pool:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as writer:
+            writes: list[tuple[Page, concurrent.futures.Future]] = []
+            outputs = _map_in_order(pool, _render_page_in_worker, len(prepared), jobs)
+            for (page, _, _), (output, timing, _) in zip(prepared, outputs):
+                assert output is not None
+                profiler.add_step(page.file.src_uri, 'template', *timing)
+                config._current_page = page
+                page.active = True
+                try:
+                    # Run `post_page` plugin events.
+                    output = config.plugins.on_post_page(output, page=page, config=config)
+                except Exception as e:
+                    _log_page_error(f"Error building page '{page.file.src_uri}':", e)
+                    raise
+                finally:
+                    page.active = False
+                    config._current_page = None
+
+                if output.strip():
+                    content = output.encode('utf-8', errors='xmlcharrefreplace')
+                    future = writer.submit(
+                        utils.write_file,
+                        content,
+                        page.file.abs_dest_path,
+                        skip_unchanged=skip_unchanged,
+                    )
+                    writes.append((page, future))
+                else:
+                    log.info(f"Page skipped: '{page.file.src_uri}'. Generated empty output.")
+
+            written = 0
+            for page, future in writes:
+                try:
+                    written += future.result()
+                except Exception as e:
+                    _log_page_error(f"Error building page '{page.file.src_uri}':", e)
+                    raise
+    return written
+
+
+def _digest(*parts: object) -> str:
+    serialized = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def _config_digest(config: MkDocsConfig) -> str:
+    """A digest of everything outside of docs_dir and the theme templates that a build depends on."""
+    # The loaded values, so that inherited config files, `!ENV` values and hooks are included.
+    return _digest(mkdocs.__version__, _stable_value(dict(config)))
+
+
+def _stable_value(value: object) -> object:
+    """A JSON-serializable form of a config value, which is the same in every process."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, types.ModuleType):  # A hook.
+        return [value.__name__, _file_digest(getattr(value, '__file__', None))]
+    if isinstance(value, BasePlugin):
+        cls = type(value)
+        return [f'{cls.__module__}.{cls.__qualname__}', _stable_value(dict(value.config))]
+    if isinstance(value, Theme):
+        return [value.name, value.dirs, sorted(value.static_templates), _stable_value(dict(value))]
+    if isinstance(value, Mapping):
+        return {str(k): _stable_value(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_stable_value(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_stable_value(v) for v in value]
+    # Such as a Markdown extension instance, whose repr may contain its memory address.
+    return re.sub(r' at 0x[0-9a-fA-F]+', '', repr(value))
+
+
+def _file_digest(path: str | None) -> str | None:
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _nav_digest(nav: Navigation, files: Files) -> str:
+    """A digest of the navigation as seen by the templates: titles and URLs of all items."""
+
+    def items(children) -> list:
+        return [
+            (
+                type(item).__name__,
+                item.title,
+                getattr(item, 'url', None),
+                items(item.children or []),
+            )
+            for item in children
+        ]
+
+    return _digest(items(nav.items), files._fingerprint)
+
+
+def _template_digest(env: jinja2.Environment, name: str) -> str:
+    """A digest of the source of a template and all templates that it extends, includes or imports."""
+    assert env.loader is not None
+    sources: dict[str, str] = {}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in sources:
+            continue
+        sources[current] = source = env.loader.get_source(env, current)[0]
+        for ref in jinja2.meta.find_referenced_templates(env.parse(source)):
+            if ref is None:
+                # The name is only known at runtime, so depend on all templates.
+                pending.extend(env.list_templates(filter_func=lambda n: n.endswith('.html')))
+            else:
+                pending.append(ref)
+    return _digest(sorted(sources.items()))
+
+
+def _link_target_signature(files: Files, path: str) -> tuple[str, int] | None:
+    file = files.get_file_from_path(path)
+    if file is None:
+        return None
+    return file.url, file.inclusion.value
+
+
+class _BuildState:
+    """
+    Records what each page depended on during a build, so that a later `--dirty` build of the same
+    site re-renders only the pages whose dependencies have changed.
+
+    It is kept in memory for the next build (e.g. by `mkdocs serve`), and in `cache_dir` if it's set.
+    """
+
+    def __init__(self, config: MkDocsConfig) -> None:
+        self.site_dir = config.site_dir
+        self.digest = _config_digest(config)
+        self.pages: dict[str, dict[str, Any]] = {}
+        self._template_digests: dict[str, str] = {}
+        self._logs: dict[str, list[tuple[str, int, str]]] = {}
+
+    _last: _BuildState | None = None
+    """The state recorded by the latest build in this process, if it can be used by the next one."""
+
+    @classmethod
+    def load(cls, config: MkDocsConfig) -> _BuildState | None:
+        """Return the state of the previous build of this site_dir, if it's known."""
+        state = cls._last
+        if (state is None or state.site_dir != config.site_dir) and config.cache_dir:
+            try:
+                with open(os.path.join(config.cache_dir, 'build-state.pickle'), 'rb') as f:
+                    state = pickle.load(f)
+            except Exception:
+                state = None
+        if not isinstance(state, cls) or state.site_dir != config.site_dir:
+            return None
+        if state.digest != _config_digest(config):
+            # The config or MkDocs itself has changed, so nothing can be reused.
+            return cls(config)
+        return state
+
+    def save(self, config: MkDocsConfig, *, in_memory: bool) -> None:
+        """Keep the state for the next build in this process if `in_memory`, and in `cache_dir`."""
+        if in_memory:
+            _BuildState._last = self
+        if not config.cache_dir:
+            return
+        path = os.path.join(config.cache_dir, 'build-state.pickle')
+        try:
+            os.makedirs(config.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=config.cache_dir, delete=False) as f:
+                pickle.dump(self, f)
+            os.replace(f.name, path)
+        except Exception as e:
+            log.debug(f"Couldn't save the build state: {e}")
+
+    def __getstate__(self) -> dict[str, Any]:
+        return dict(self.__dict__, _template_digests={}, _logs={})
+
+    def restore_page(self, page: Page, files: Files) -> bool:
+        """If none of the inputs of the page's Markdown changed, populate the page from the record."""
+        record = self.pages.get(page.file.src_uri)
+        if record is None or record['url'] != page.file.url or 'logs' not in record:
+            return False
+        if record['inclusion'] != page.file.inclusion.value:
+            return False
+        for path, signature in record['link_targets'].items():
+            if _link_target_signature(files, path) != signature:
+                return False
+        try:
+            if record['source'] != hashlib.sha256(page.file.content_bytes).hexdigest():
+                return False
+        except OSError:
+            return False
+        # Report the same warnings as when the page was rendered, e.g. for `--strict`.
+        for name, levelno, msg in record['logs']:
+            logging.getLogger(name).log(levelno, msg)
+        _set_page_state(page, record['state'], files)
+        return True
+
+    def record_restored_page(self, page: Page, previous: _BuildState) -> None:
+        """Keep the record of a page that was restored from the `previous` state."""
+        self.pages[page.file.src_uri] = dict(previous.pages[page.file.src_uri])
+
+    def record_logs(self, page: Page, records: Iterable[logging.LogRecord]) -> None:
+        """Keep the messages that were logged while the page was populated, for `restore_page`."""
+        self._logs[page.file.src_uri] = [(r.name, r.levelno, r.getMessage()) for r in records]
+
+    def record_page(self, page: Page, files: Files) -> None:
+        if page.content is None or page.file.src_uri in self.pages:
+            return
+        self.pages[page.file.src_uri] = {
+            'source': hashlib.sha256(page.file.content_bytes).hexdigest(),
+            'url': page.file.url,
+            'inclusion': page.file.inclusion.value,
+            'link_targets': {
+                path: _link_target_signature(files, path) for path in page._link_targets
+            },
+            'state': _get_page_state(page),
+            'logs': self._logs.pop(page.file.src_uri, []),
+        }
+
+    def record_output(self, page: Page, env: jinja2.Environment, nav_digest: str) -> str | None:
+        """Record and return the digest of everything that the page's template output depends on."""
+        record = self.pages.get(page.file.src_uri)
+        if record is None:
+            return None
+        template_name = page.meta.get('template', 'main.html')
+        if template_name not in self._template_digests:
+            try:
+                self._template_digests[template_name] = _template_digest(env, template_name)
+            except jinja2.TemplateError:
+                return None  # Let the build report this later.
+        record['output'] = _digest(
+            nav_digest,
+            self._template_digests[template_name],
+            page.url,
+            page.title,
+            page.content,
+            str(page.toc),
+            page.meta,
+        )
+        return record['output']
+
+    def is_output_unchanged(self, page: Page, output: str | None) -> bool:
+        record = self.pages.get(page.file.src_uri)
+        return (
+            output is not None
+            and record is not None
+            and record.get('output') == output
+            and os.path.isfile(page.file.abs_dest_path)
+        )
+
+
+def build(
+    config: MkDocsConfig,
+    *,
+    serve_url: str | None = None,
+    dirty: bool = False,
+    jobs: int = 1,
+    atomic: bool = False,
+    profiler: Profiler | None = None,
+) -> None:
+    """
+    Perform a full site build.
+
+    With `jobs` greater than 1, Markdown pages and their templates are rendered by that many
+    worker processes, and static files are copied by that many threads.
+
+    With `atomic`, the site is built in a staging directory next to `site_dir`, which replaces
+    `site_dir` only once the build has succeeded.
+
+    The duration of each phase of the build and of each page is recorded into `profiler`.
+    """
+    if atomic and dirty:
+        raise ValueError("An atomic build can't be combined with a dirty build.")
+    if profiler is None:
+        profiler = Profiler()
+
     logger = logging.getLogger('mkdocs')
 
     # Add CountHandler for strict mode
@@ -257,9 +938,12 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         logging.getLogger('mkdocs').addHandler(warning_counter)
 
     inclusion = InclusionLevel.is_in_serve if serve_url else InclusionLevel.is_included
+    site_dir = config.site_dir
+    staging_dir = None
 
     try:
         start = time.monotonic()
+        profiler.start_phase('config')
 
         # Run `config` plugin events.
         config = config.plugins.on_config(config)
@@ -267,9 +951,26 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         # Run `pre_build` plugin events.
         config.plugins.on_pre_build(config=config)
 
-        if not dirty:
+        previous_state = _BuildState.load(config) if dirty else None
+        # Only record what the pages depend on if a later build can make use of it.
+        keep_state = dirty
+        build_state = _BuildState(config) if keep_state or config.cache_dir else None
+        if not keep_state:
+            # Don't hold on to the pages of a previous build for the rest of the process.
+            _BuildState._last = None
+        # Without the record of a previous build, fall back to comparing modification times.
+        skip_unmodified = dirty and previous_state is None
+        if atomic:
+            config.site_dir = staging_dir = _create_staging_dir(site_dir)
+            log.debug(f"Building documentation to the staging directory: {staging_dir}")
+        elif not dirty:
             log.info("Cleaning site directory")
             utils.clean_directory(config.site_dir)
+        elif previous_state is not None:
+            log.info(
+                "Rebuilding only the pages affected by changes since the previous build. Output "
+                "that plugins derive from pages in other events than 'page_context' may be incomplete."
+            )
         else:  # pragma: no cover
             # Warn user about problems that may occur with --dirty option
             log.warning(
@@ -278,14 +979,15 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
             )
 
         if not serve_url:  # pragma: no cover
-            log.info(f"Building documentation to directory: {config.site_dir}")
+            log.info(f"Building documentation to directory: {site_dir}")
             if dirty and site_directory_contains_stale_files(config.site_dir):
                 log.info("The directory contains stale files. Use --clean to remove them.")
 
         # First gather all data from all files/pages to ensure all data is consistent across all pages.
 
+        profiler.start_phase('files')
         files = get_files(config)
-        env = config.theme.get_env()
+        env = config.theme.get_env(cache_dir=config.cache_dir)
         files.add_files_from_theme(env, config)
 
         # Run `files` plugin events.
@@ -293,13 +995,17 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         # If plugins have added files but haven't set their inclusion level, calculate it again.
         set_exclusions(files, config)
 
+        profiler.start_phase('nav')
         nav = get_navigation(files, config)
 
         # Run `nav` plugin events.
         nav = config.plugins.on_nav(nav, config=config, files=files)
 
         log.debug("Reading markdown pages.")
+        profiler.start_phase('read pages')
+        parallel = jobs > 1 and _can_render_in_parallel(config, _PARALLEL_PAGE_EVENTS)
         excluded = []
+        pages = []
         for file in files.documentation_pages(inclusion=inclusion):
             log.debug(f"Reading: {file.src_uri}")
             if file.page is None and file.inclusion.is_not_in_nav():
@@ -307,7 +1013,37 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
                     excluded.append(urljoin(serve_url, file.url))
                 Page(None, file, config)
             assert file.page is not None
-            _populate_page(file.page, config, files, dirty)
+            if previous_state is not None and previous_state.restore_page(file.page, files):
+                if build_state is not None:
+                    build_state.record_restored_page(file.page, previous_state)
+                continue
+            # When --dirty is used, only read the page if the file has been modified since the
+            # previous build of the output.
+            if not skip_unmodified or file.is_modified():
+                pages.append(file.page)
+
+        # Run `pre_page_batch` plugin events.
+        config.plugins.on_pre_page_batch(pages, config=config, files=files)
+
+        if parallel and pages:
+            _populate_pages_in_parallel(
+                pages, config, files, jobs, profiler=profiler, build_state=build_state
+            )
+        else:
+            capture = utils.CaptureHandler()
+            if build_state is not None:
+                logger.addHandler(capture)
+            try:
+                for page in pages:
+                    with profiler.step(page.file.src_uri, 'markdown'):
+                        _populate_page(page, config, files)
+                    if build_state is not None:
+                        build_state.record_logs(page, capture.pop_records())
+            finally:
+                logger.removeHandler(capture)
+
+        # Run `page_content_batch` plugin events.
+        config.plugins.on_page_content_batch(pages, config=config, files=files)
         if excluded:
             log.info(
                 "The following pages are being built only for the preview "
@@ -316,40 +1052,110 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
             )
 
         # Run `env` plugin events.
+        profiler.start_phase('env')
         env = config.plugins.on_env(env, config=config, files=files)
 
         # Start writing files to site_dir now that all data is gathered. Note that order matters. Files
         # with lower precedence get written first so that files with higher precedence can overwrite them.
 
         log.debug("Copying static assets.")
-        files.copy_static_files(dirty=dirty, inclusion=inclusion)
+        profiler.start_phase('static files')
+        files.copy_static_files(
+            dirty=dirty, inclusion=inclusion, strategy=config.copy_strategy, jobs=jobs
+        )
 
+        # Without cleaning the site directory first, leave identical files untouched.
+        skip_unchanged = dirty
+        written = total = 0
+        profiler.start_phase('templates')
         for template in config.theme.static_templates:
-            _build_theme_template(template, env, files, config, nav)
+            total += 1
+            written += _build_theme_template(
+                template, env, files, config, nav, skip_unchanged=skip_unchanged
+            )
 
         for template in config.extra_templates:
-            _build_extra_template(template, files, config, nav)
+            total += 1
+            written += _build_extra_template(
+                template, files, config, nav, skip_unchanged=skip_unchanged
+            )
 
         log.debug("Building markdown pages.")
+        profiler.start_phase('build pages')
         doc_files = files.documentation_pages(inclusion=inclusion)
-        for file in doc_files:
-            assert file.page is not None
-            _build_page(
-                file.page, config, doc_files, nav, env, dirty, excluded=file.inclusion.is_excluded()
+        unchanged = set()
+        if build_state is not None:
+            nav_digest = _nav_digest(nav, files)
+            for file in doc_files:
+                assert file.page is not None
+                build_state.record_page(file.page, files)
+                output = build_state.record_output(file.page, env, nav_digest)
+                if previous_state is not None and previous_state.is_output_unchanged(
+                    file.page, output
+                ):
+                    unchanged.add(file.src_uri)
+        if unchanged:
+            log.debug(
+                f"Skipping {len(unchanged)} pages that are unchanged since the previous build."
+            )
+        total += len(doc_files)
+        if jobs > 1 and _can_render_in_parallel(config, _PARALLEL_TEMPLATE_EVENTS):
+            written += _build_pages_in_parallel(
+                doc_files,
+                doc_files,
+                config,
+                nav,
+                env,
+                skip_unmodified,
+                jobs,
+                skip_unchanged=skip_unchanged,
+                unchanged=unchanged,
+                profiler=profiler,
+            )
+        else:
+            for file in doc_files:
+                assert file.page is not None
+                if file.src_uri in unchanged:
+                    _run_page_context_event(file.page, config, doc_files, nav)
+                    continue
+                with profiler.step(file.src_uri, 'template'):
+                    written += _build_page(
+                        file.page,
+                        config,
+                        doc_files,
+                        nav,
+                        env,
+                        skip_unmodified,
+                        excluded=file.inclusion.is_excluded(),
+                        skip_unchanged=skip_unchanged,
+                    )
+        if dirty:
+            log.info(
+                f"{written} of {total} pages and templates were changed in the site directory."
             )
 
+        profiler.start_phase('validate anchors')
         log_level = config.validation.links.anchors
         for file in doc_files:
             assert file.page is not None
             file.page.validate_anchor_links(files=files, log_level=log_level)
 
         # Run `post_build` plugin events.
+        profiler.start_phase('post_build')
         config.plugins.on_post_build(config=config)
+        profiler.end_phase()
 
         if counts := warning_counter.get_counts():
             msg = ', '.join(f'{v} {k.lower()}s' for k, v in counts)
             raise Abort(f'Aborted with {msg} in strict mode!')
 
+        if staging_dir is not None:
+            _swap_site_dir(staging_dir, site_dir)
+            staging_dir = None
+
+        if build_state is not None:
+            build_state.save(config, in_memory=keep_state)
+
         log.info(f'Documentation built in {time.monotonic() - start:.2f} seconds')
 
     except Exception as e:
@@ -362,6 +1168,128 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
 
     finally:
         logger.removeHandler(warning_counter)
+        # Don't keep the nav, files and config of this build alive until the next one.
+        _ContextFactory._last = None
+        if atomic:
+            config.site_dir = site_dir
+            # The build has failed, leave the current site as it is.
+            if staging_dir is not None:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _create_staging_dir(site_dir: str) -> str:
+    """Create an empty hidden directory next to `site_dir`, to build the site into."""
+    parent, name = os.path.split(os.path.abspath(site_dir))
+    os.makedirs(parent, exist_ok=True)
+    while True:
+        path = os.path.join(parent, f'.{name}.{secrets.token_hex(4)}')
+        try:
+            # Unlike `tempfile.mkdtemp`, this creates the directory with the usual permissions.
+            os.mkdir(path)
+        except FileExistsError:
+            continue
+        return path
+
+
+def _is_staging_dir(path: str, site_dir: str) -> bool:
+    parent, name = os.path.split(os.path.abspath(site_dir))
+    return os.path.dirname(path) == parent and os.path.basename(path).startswith(f'.{name}.')
+
+
+def _swap_site_dir(staging_dir: str, site_dir: str) -> None:
+    """
+    Put the staging directory in place of `site_dir`, and delete the old tree in the background.
+
+    If `site_dir` is a symlink, it is atomically replaced by a symlink to the staging directory.
+    A directory is atomically exchanged with the staging directory where the OS supports it
+    (Linux). Elsewhere it is renamed away first, so it's missing for an instant.
+    """
+    if os.path.islink(site_dir):
+        old_dir = os.path.realpath(site_dir)
+        # The previous target is only deleted if an earlier atomic build created it,
+        # a directory that the user manages is left as it is.
+        is_own = _is_staging_dir(old_dir, site_dir)
+        if is_own:
+            _move_hidden_entries(old_dir, staging_dir)
+        link = f'{staging_dir}.link'
+        os.symlink(os.path.basename(staging_dir), link)
+        os.replace(link, site_dir)
+        if not is_own:
+            return
+    elif os.path.isdir(site_dir):
+        _move_hidden_entries(site_dir, staging_dir)
+        if _exchange_paths(staging_dir, site_dir):
+            old_dir = staging_dir
+        else:
+            old_dir = f'{staging_dir}.old'
+            os.rename(site_dir, old_dir)
+            os.rename(staging_dir, site_dir)
+    else:
+        if os.path.lexists(site_dir):
+            os.remove(site_dir)
+        os.rename(staging_dir, site_dir)
+        return
+
+    if not old_dir.endswith('.old'):
+        os.rename(old_dir, f'{old_dir}.old')
+    _delete_old_trees(site_dir)
+
+
+def _move_hidden_entries(from_dir: str, to_dir: str) -> None:
+    """A clean build never deletes hidden files from site_dir (such as `.git`), so carry them over."""
+    for entry in os.listdir(from_dir):
+        if entry.startswith('.') and not os.path.lexists(os.path.join(to_dir, entry)):
+            os.rename(os.path.join(from_dir, entry), os.path.join(to_dir, entry))
+
+
+def _exchange_paths(path1: str, path2: str) -> bool:
+    """Atomically exchange two paths with `renameat2(RENAME_EXCHANGE)`, if the OS supports it."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):  # pragma: no cover
+        return False
+    at_fdcwd, rename_exchange = -100, 2
+    if renameat2(at_fdcwd, os.fsencode(path1), at_fdcwd, os.fsencode(path2), rename_exchange):
+        err = ctypes.get_errno()
+        if err in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP):  # Not supported by the filesystem.
+            return False
+        raise OSError(err, os.strerror(err), path1, None, path2)
+    return True
+
+
+_cleanup_threads: list[threading.Thread] = []
+
+
+def _delete_old_trees(site_dir: str) -> None:
+    """
+    Delete the trees replaced by atomic builds of `site_dir` in a background thread.
+
+    This also deletes any that were left over because the process exited before they were deleted.
+    """
+    parent, name = os.path.split(os.path.abspath(site_dir))
+    old_dirs = [
+        os.path.join(parent, entry)
+        for entry in os.listdir(parent)
+        if entry.startswith(f'.{name}.') and entry.endswith('.old')
+    ]
+
+    def delete() -> None:
+        for path in old_dirs:
+            log.debug(f"Deleting the previous build: {path}")
+            shutil.rmtree(path, ignore_errors=True)
+
+    # A daemon thread doesn't keep the process running, see `wait_for_cleanup`.
+    thread = threading.Thread(target=delete, name='mkdocs-cleanup', daemon=True)
+    _cleanup_threads.append(thread)
+    thread.start()
+
+
+def wait_for_cleanup() -> None:
+    """Wait until the previous sites that were replaced by atomic builds have been deleted."""
+    while _cleanup_threads:
+        _cleanup_threads.pop().join()
 
 
 def site_directory_contains_stale_files(site_directory: str) -> bool:
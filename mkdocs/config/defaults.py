@@ -79,6 +79,14 @@ class MkDocsConfig(base.Config):
     site_dir = c.SiteDir(default='site')
     """The directory where the site will be built to"""
 
+    cache_dir = c.Optional(c.Dir())
+    """A directory to keep the rendered HTML of Markdown pages in between builds.
+    Pages whose source and relevant config haven't changed are not converted again."""
+
+    copy_strategy = c.Choice(('copy', 'reflink', 'hardlink'), default='copy')
+    """How static files are put into the site_dir: copied, cloned where the file system supports
+    it, or hard-linked to the files in docs_dir. The latter two fall back to copying."""
+
     copyright = c.Optional(c.Type(str))
     """A copyright notice to add to the footer of documentation."""
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import gzip
 import logging
 import os
+import shutil
 from typing import TYPE_CHECKING, List
 
 from mkdocs import utils
@@ -10,6 +12,13 @@ from mkdocs.config import config_options as c
 from mkdocs.contrib.search.search_index import SearchIndex
 from mkdocs.plugins import BasePlugin
 
+try:
+    import brotli  # type: ignore
+
+    hasbrotli = True
+except ImportError:  # pragma: no cover
+    hasbrotli = False
+
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocs.structure.pages import Page
@@ -56,6 +65,9 @@ class _PluginConfig(base.Config):
     separator = c.Type(str, default=r'[\s\-]+')
     min_search_length = c.Type(int, default=3)
     prebuild_index = c.Choice((False, True, 'node', 'python'), default=False)
+    sharded_index = c.Type(bool, default=False)
+    index_format = c.Choice(('json', 'compact'), default='json')
+    compress = c.ListOfItems(c.Choice(('gzip', 'brotli')), default=[])
     indexing = c.Choice(('full', 'sections', 'titles'), default='full')
 
 
@@ -95,9 +107,35 @@ class SearchPlugin(BasePlugin[_PluginConfig]):
     def on_post_build(self, config: MkDocsConfig, **kwargs) -> None:
         """Build search index."""
         output_base_path = os.path.join(config.site_dir, 'search')
-        search_index = self.search_index.generate_search_index()
-        json_output_path = os.path.join(output_base_path, 'search_index.json')
-        utils.write_file(search_index.encode('utf-8'), json_output_path)
+        if self.config.sharded_index:
+            outputs = self.search_index.generate_sharded_search_index()
+            paths = [os.path.join(output_base_path, path) for path in outputs]
+            # Don't leave the shards of a previous build behind.
+            _remove_stale_shards(os.path.join(output_base_path, 'shards'), paths)
+            written = [
+                utils.write_file(data.encode('utf-8'), path, skip_unchanged=True)
+                for path, data in zip(paths, outputs.values())
+            ]
+        else:
+            paths = [os.path.join(output_base_path, 'search_index.json')]
+            written = [
+                utils.write_file(
+                    self.search_index.generate_search_index_chunks(
+                        compact=self.config.index_format == 'compact'
+                    ),
+                    paths[0],
+                    skip_unchanged=True,
+                )
+            ]
+        compress = self.config.compress
+        if 'brotli' in compress and not hasbrotli:
+            log.warning(
+                "The search plugin's 'compress' config option includes 'brotli', "
+                "but the 'brotli' package is not installed. Skipping the '.br' files."
+            )
+            compress = [method for method in compress if method != 'brotli']
+        for path, rewritten in zip(paths, written):
+            _update_compressed(path, compress, rewritten=rewritten)
 
         assert self.config.lang is not None
         if not config.theme.get('search_index_only'):
@@ -117,4 +155,59 @@ class SearchPlugin(BasePlugin[_PluginConfig]):
             for filename in files:
                 from_path = os.path.join(base_path, 'lunr-language', filename)
                 to_path = os.path.join(output_base_path, filename)
-                utils.copy_file(from_path, to_path)
+                utils.copy_file(from_path, to_path, skip_unchanged=True)
+
+
+_COMPRESSED_SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+
+
+def _remove_stale_shards(shards_dir: str, paths: list[str]) -> None:
+    """Remove the files in `shards_dir` that aren't one of `paths` or a compressed copy of one."""
+    keep = {os.path.basename(path) for path in paths if os.path.dirname(path) == shards_dir}
+    try:
+        names = os.listdir(shards_dir)
+    except FileNotFoundError:
+        return
+    for name in names:
+        base, ext = os.path.splitext(name)
+        if name not in keep and not (ext in _COMPRESSED_SUFFIXES.values() and base in keep):
+            os.remove(os.path.join(shards_dir, name))
+
+
+def _update_compressed(path: str, methods: list[str], *, rewritten: bool) -> None:
+    """
+    Write the compressed copies of the file for `methods`, and remove those for other methods.
+
+    Unless the file was rewritten, a copy that is newer than the file is left as it is.
+    """
+    for method, suffix in _COMPRESSED_SUFFIXES.items():
+        compressed_path = path + suffix
+        if method not in methods:
+            try:
+                os.remove(compressed_path)
+            except FileNotFoundError:
+                pass
+            continue
+        if not rewritten:
+            try:
+                if os.stat(compressed_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                pass
+        _write_compressed(path, method)
+
+
+def _write_compressed(path: str, method: str) -> None:
+    """Write a copy of the file compressed with `method` next to it, as `.gz` or `.br`."""
+    with open(path, 'rb') as src:
+        if method == 'gzip':
+            with open(path + '.gz', 'wb') as f:
+                # No name or time in the header, so that the output is reproducible.
+                with gzip.GzipFile(filename='', mode='wb', fileobj=f, mtime=0) as dst:
+                    shutil.copyfileobj(src, dst)
+        else:
+            compressor = brotli.Compressor()
+            with open(path + '.br', 'wb') as dst:
+                for chunk in iter(lambda: src.read(1 << 16), b''):
+                    dst.write(compressor.process(chunk))
+                dst.write(compressor.finish())
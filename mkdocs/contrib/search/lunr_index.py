@@ -0,0 +1,321 @@
+"""
+Builds a serialized Lunr.js index in Python, the same as `prebuild-index.js` does for English.
+
+This follows lunr.js 2.3.9 (`templates/search/lunr.js`): the same tokenizer, trimmer,
+stop word filter and Porter stemmer, and the same BM25 scores for the field vectors.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+from typing import Any, Iterable
+
+LUNR_VERSION = '2.3.9'
+
+# `lunr.tokenizer.separator`
+DEFAULT_SEPARATOR = r'[\s\-]+'
+
+# `lunr.stopWordFilter`
+STOP_WORDS = frozenset(
+    """
+    a able about across after all almost also am among an and any are as at be because been but
+    by can cannot could dear did do does either else ever every for from get got had has have he
+    her hers him his how however i if in into is it its just least let like likely may me might
+    most must my neither no nor not of off often on only or other our own rather said say says she
+    should since so some than that the their them then there these they this tis to too twas us
+    wants was we were what when where which while who whom why will with would yet you your
+    """.split()
+)
+
+# JavaScript's `\W` is ASCII-only.
+_TRIM_RE = re.compile(r'^\W+|\W+\Z', re.ASCII)
+
+
+def _js_round(x: float) -> float:
+    """`Math.round`, which rounds halves up, unlike `round`."""
+    r = math.floor(x)
+    return r + 1 if x - r >= 0.5 else r
+
+
+def _utf16_key(s: str) -> bytes:
+    """Sort strings the same as JavaScript does, by their UTF-16 code units."""
+    return s.encode('utf-16-be', 'surrogatepass')
+
+
+class _PorterStemmer:
+    """`lunr.stemmer`, a port of the same JavaScript implementation of the Porter stemmer."""
+
+    _step2list = {
+        'ational': 'ate',
+        'tional': 'tion',
+        'enci': 'ence',
+        'anci': 'ance',
+        'izer': 'ize',
+        'bli': 'ble',
+        'alli': 'al',
+        'entli': 'ent',
+        'eli': 'e',
+        'ousli': 'ous',
+        'ization': 'ize',
+        'ation': 'ate',
+        'ator': 'ate',
+        'alism': 'al',
+        'iveness': 'ive',
+        'fulness': 'ful',
+        'ousness': 'ous',
+        'aliti': 'al',
+        'iviti': 'ive',
+        'biliti': 'ble',
+        'logi': 'log',
+    }
+    _step3list = {
+        'icate': 'ic',
+        'ative': '',
+        'alize': 'al',
+        'iciti': 'ic',
+        'ical': 'ic',
+        'ful': '',
+        'ness': '',
+    }
+
+    # JavaScript's `.` doesn't match any line terminator, and `$` only matches at the very end.
+    _dot = r'[^\n\r\u2028\u2029]'
+    _c = '[^aeiou]'  # consonant
+    _v = '[aeiouy]'  # vowel
+    _C = _c + '[^aeiouy]*'  # consonant sequence
+    _V = _v + '[aeiou]*'  # vowel sequence
+
+    _re_mgr0 = re.compile('^(' + _C + ')?' + _V + _C)  # [C]VC... is m>0
+    _re_meq1 = re.compile('^(' + _C + ')?' + _V + _C + '(' + _V + r')?\Z')  # [C]VC[V] is m=1
+    _re_mgr1 = re.compile('^(' + _C + ')?' + _V + _C + _V + _C)  # [C]VCVC... is m>1
+    _re_s_v = re.compile('^(' + _C + ')?' + _v)  # vowel in stem
+
+    _re_1a = re.compile(f'^({_dot}+?)(ss|i)es\\Z')
+    _re2_1a = re.compile(f'^({_dot}+?)([^s])s\\Z')
+    _re_1b = re.compile(f'^({_dot}+?)eed\\Z')
+    _re2_1b = re.compile(f'^({_dot}+?)(ed|ing)\\Z')
+    _re_1b_2 = re.compile(f'{_dot}\\Z')
+    _re2_1b_2 = re.compile(r'(at|bl|iz)\Z')
+    _re3_1b_2 = re.compile(r'([^aeiouylsz])\1\Z')
+    _re4_1b_2 = re.compile('^' + _C + _v + r'[^aeiouwxy]\Z')
+
+    _re_1c = re.compile(f'^({_dot}+?[^aeiou])y\\Z')
+    _re_2 = re.compile(
+        f'^({_dot}+?)(ational|tional|enci|anci|izer|bli|alli|entli|eli|ousli|ization|ation|ator'
+        '|alism|iveness|fulness|ousness|aliti|iviti|biliti|logi)\\Z'
+    )
+    _re_3 = re.compile(f'^({_dot}+?)(icate|ative|alize|iciti|ical|ful|ness)\\Z')
+    _re_4 = re.compile(
+        f'^({_dot}+?)(al|ance|ence|er|ic|able|ible|ant|ement|ment|ent|ou|ism|ate|iti|ous|ive|ize)\\Z'
+    )
+    _re2_4 = re.compile(f'^({_dot}+?)(s|t)(ion)\\Z')
+
+    _re_5 = re.compile(f'^({_dot}+?)e\\Z')
+    _re_5_1 = re.compile(r'll\Z')
+    _re3_5 = re.compile('^' + _C + _v + r'[^aeiouwxy]\Z')
+
+    def __init__(self) -> None:
+        self._cache: dict[str, str] = {}
+
+    def __call__(self, w: str) -> str:
+        result = self._cache.get(w)
+        if result is None:
+            result = self._cache[w] = self._stem(w)
+        return result
+
+    def _stem(self, w: str) -> str:
+        # The length in UTF-16 code units, as in JavaScript.
+        if len(w.encode('utf-16-le', 'surrogatepass')) < 6:
+            return w
+
+        firstch = w[0]
+        if firstch == 'y':
+            w = 'Y' + w[1:]
+
+        # Step 1a
+        if self._re_1a.search(w):
+            w = self._re_1a.sub(r'\1\2', w, count=1)
+        elif self._re2_1a.search(w):
+            w = self._re2_1a.sub(r'\1\2', w, count=1)
+
+        # Step 1b
+        if fp := self._re_1b.search(w):
+            if self._re_mgr0.search(fp[1]):
+                w = self._re_1b_2.sub('', w, count=1)
+        elif fp := self._re2_1b.search(w):
+            stem = fp[1]
+            if self._re_s_v.search(stem):
+                w = stem
+                if self._re2_1b_2.search(w):
+                    w = w + 'e'
+                elif self._re3_1b_2.search(w):
+                    w = self._re_1b_2.sub('', w, count=1)
+                elif self._re4_1b_2.search(w):
+                    w = w + 'e'
+
+        # Step 1c
+        if fp := self._re_1c.search(w):
+            w = fp[1] + 'i'
+
+        # Step 2
+        if fp := self._re_2.search(w):
+            stem, suffix = fp[1], fp[2]
+            if self._re_mgr0.search(stem):
+                w = stem + self._step2list[suffix]
+
+        # Step 3
+        if fp := self._re_3.search(w):
+            stem, suffix = fp[1], fp[2]
+            if self._re_mgr0.search(stem):
+                w = stem + self._step3list[suffix]
+
+        # Step 4
+        if fp := self._re_4.search(w):
+            stem = fp[1]
+            if self._re_mgr1.search(stem):
+                w = stem
+        elif fp := self._re2_4.search(w):
+            stem = fp[1] + fp[2]
+            if self._re_mgr1.search(stem):
+                w = stem
+
+        # Step 5
+        if fp := self._re_5.search(w):
+            stem = fp[1]
+            if self._re_mgr1.search(stem) or (
+                self._re_meq1.search(stem) and not self._re3_5.search(stem)
+            ):
+                w = stem
+
+        if self._re_5_1.search(w) and self._re_mgr1.search(w):
+            w = self._re_1b_2.sub('', w, count=1)
+
+        # Turn initial Y back to y
+        if firstch == 'y':
+            w = 'y' + w[1:]
+
+        return w
+
+
+class _Tokenizer:
+    """`lunr.tokenizer` with `lunr.tokenizer.separator` set to `separator`."""
+
+    def __init__(self, separator: str) -> None:
+        self._separator = re.compile(separator)
+        # Lunr.js matches the separator against each character on its own, so the
+        # characters are classified once and the text is split on the separator ones.
+        # Note that `\s` differs from JavaScript's for U+FEFF, U+0085 and U+001C-U+001F.
+        self._is_separator: dict[str, bool] = {}
+        self._split = re.compile('(?!)').split
+
+    def __call__(self, text: Any) -> list[str]:
+        if text is None:
+            return []
+        text = str(text).lower()
+        if new_chars := set(text).difference(self._is_separator):
+            for char in new_chars:
+                self._is_separator[char] = bool(self._separator.search(char))
+            separators = ''.join(c for c, is_sep in self._is_separator.items() if is_sep)
+            if separators:
+                self._split = re.compile(f'[{re.escape(separators)}]').split
+        return [token for token in self._split(text) if token]
+
+
+def build_index(
+    documents: Iterable[dict[str, Any]],
+    *,
+    ref: str = 'location',
+    fields: tuple[str, ...] = ('title', 'text'),
+    separator: str | None = None,
+) -> dict[str, Any]:
+    """
+    Return the serialized Lunr.js index of the documents (`lunr.Index.toJSON()`).
+
+    The index uses the default English pipeline. `separator` is a regular expression
+    that must also be valid in JavaScript, as Lunr.js uses it for the search queries.
+    """
+    tokenize = _Tokenizer(separator or DEFAULT_SEPARATOR)
+    trim = functools.partial(_TRIM_RE.sub, '')
+    stem = _PorterStemmer()
+    k1, b = 1.2, 0.75
+
+    # term -> {'_index': n, field: {ref: {}}}
+    inverted_index: dict[str, dict[str, Any]] = {}
+    # 'field/ref' -> {term: frequency}
+    field_term_frequencies: dict[str, dict[str, int]] = {}
+    field_lengths: dict[str, int] = {}
+    document_count = 0
+
+    for doc in documents:
+        doc_ref = doc[ref]
+        document_count += 1
+        for field_name in fields:
+            # Like Lunr.js, this keeps the tokens that end up empty after trimming.
+            terms = [
+                stem(token)
+                for token in map(trim, tokenize(doc.get(field_name)))
+                if token not in STOP_WORDS
+            ]
+
+            field_ref = f'{field_name}/{doc_ref}'
+            field_terms: dict[str, int] = {}
+            field_term_frequencies[field_ref] = field_terms
+            field_lengths[field_ref] = len(terms)
+
+            for term in terms:
+                field_terms[term] = field_terms.get(term, 0) + 1
+                posting = inverted_index.get(term)
+                if posting is None:
+                    posting = {'_index': len(inverted_index)}
+                    for name in fields:
+                        posting[name] = {}
+                    inverted_index[term] = posting
+                posting[field_name].setdefault(doc_ref, {})
+
+    # `calculateAverageFieldLengths`
+    totals = dict.fromkeys(fields, 0)
+    counts = dict.fromkeys(fields, 0)
+    for field_ref, length in field_lengths.items():
+        field_name = field_ref.partition('/')[0]
+        totals[field_name] += length
+        counts[field_name] += 1
+    average_field_length = {
+        name: totals[name] / counts[name] if counts[name] else math.nan for name in fields
+    }
+
+    # `createFieldVectors`
+    idf_cache: dict[str, float] = {}
+    field_vectors = []
+    for field_ref, term_frequencies in field_term_frequencies.items():
+        field_name = field_ref.partition('/')[0]
+        field_length = field_lengths[field_ref]
+        elements = []
+        for term, tf in term_frequencies.items():
+            posting = inverted_index[term]
+            idf = idf_cache.get(term)
+            if idf is None:
+                documents_with_term = sum(len(posting[name]) for name in fields)
+                x = (document_count - documents_with_term + 0.5) / (documents_with_term + 0.5)
+                idf = idf_cache[term] = math.log(1 + abs(x))
+            score = (
+                idf
+                * ((k1 + 1) * tf)
+                / (k1 * (1 - b + b * (field_length / average_field_length[field_name])) + tf)
+            )
+            score = _js_round(score * 1000) / 1000
+            # JSON from JavaScript has no '.0' for whole numbers.
+            elements.append((posting['_index'], int(score) if score.is_integer() else score))
+        elements.sort()
+        field_vectors.append([field_ref, [value for element in elements for value in element]])
+
+    return {
+        'version': LUNR_VERSION,
+        'fields': list(fields),
+        'fieldVectors': field_vectors,
+        'invertedIndex': [
+            [term, inverted_index[term]] for term in sorted(inverted_index, key=_utf16_key)
+        ],
+        'pipeline': ['stemmer'],
+    }
@@ -5,8 +5,11 @@ import logging
 import os
 import re
 import subprocess
+from html import unescape
 from html.parser import HTMLParser
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from mkdocs.contrib.search import lunr_index
 
 if TYPE_CHECKING:
     from mkdocs.structure.pages import Page
@@ -61,10 +64,8 @@ class SearchIndex:
         # Create the content parser and feed in the HTML for the
         # full page. This handles all the parsing and prepares
         # us to iterate through it.
-        parser = ContentParser()
         assert page.content is not None
-        parser.feed(page.content)
-        parser.close()
+        parser = ContentParser.from_html(page.content)
 
         # Get the absolute URL for the page, this is then
         # prepended to the urls of the sections
@@ -75,8 +76,10 @@ class SearchIndex:
         self._add_entry(title=page.title, text=text, loc=url)
 
         if self.config['indexing'] in ['full', 'sections']:
+            toc_items = _toc_items_by_id(page.toc)
             for section in parser.data:
-                self.create_entry_for_section(section, page.toc, url)
+                toc_item = toc_items.get(section.id) if section.id is not None else None
+                self._add_section_entry(section, toc_item, url)
 
     def create_entry_for_section(
         self, section: ContentSection, toc: TableOfContents, abs_url: str
@@ -86,16 +89,136 @@ class SearchIndex:
         the absolute url for the page create an entry in the
         index.
         """
-        toc_item = self._find_toc_by_id(toc, section.id)
+        self._add_section_entry(section, self._find_toc_by_id(toc, section.id), abs_url)
 
+    def _add_section_entry(
+        self, section: ContentSection, toc_item: AnchorLink | None, abs_url: str
+    ) -> None:
         text = ' '.join(section.text) if self.config['indexing'] == 'full' else ''
         if toc_item is not None:
             self._add_entry(title=toc_item.title, text=text, loc=abs_url + toc_item.url)
 
     def generate_search_index(self) -> str:
         """Python to json conversion."""
-        page_dicts = {'docs': self._entries, 'config': self.config}
-        data = json.dumps(page_dicts, sort_keys=True, separators=(',', ':'), default=str)
+        return _dumps(self._generate())
+
+    def generate_search_index_chunks(self, *, compact: bool = False) -> Iterator[bytes]:
+        """
+        The same as `generate_search_index`, encoded as UTF-8, in chunks.
+
+        This avoids having the whole JSON in memory at once, for writing it to a file.
+        With `compact`, the documents and the pre-built index are in the compact format instead.
+        """
+        page_dicts = self._generate()
+        if compact:
+            compact_dicts = _compact(page_dicts)
+            if compact_dicts is None:
+                log.warning(
+                    "The pre-built search index can't be written in the compact format. "
+                    "Writing it in the default format instead."
+                )
+            else:
+                page_dicts = {'config': self.config, 'compact': compact_dicts}
+        for chunk in _iter_json(page_dicts):
+            yield chunk.encode('utf-8')
+
+    def generate_sharded_search_index(self) -> dict[str, str]:
+        """
+        Split the search index into a manifest and shards, so clients fetch only what they need.
+
+        Return the JSON of each file by its path relative to the `search` directory.
+        The manifest, `search_index.json`, has the title of each document, and the
+        `shards` of the pre-built index (by the first character of each term) and
+        of the text of the documents.
+        """
+        page_dicts = self._generate()
+        if 'index' not in page_dicts:
+            log.warning(
+                "The search index can only be sharded if it is pre-built. "
+                "Writing a single search index instead."
+            )
+            return {'search_index.json': _dumps(page_dicts)}
+        index = page_dicts['index']
+        files = {}
+
+        terms: dict[str, list] = {}
+        shard_by_term_index = {}
+        for term, posting in index['invertedIndex']:
+            name = _term_shard(term)
+            terms.setdefault(name, []).append([term, posting])
+            shard_by_term_index[posting['_index']] = name
+        # Each shard has the parts of the field vectors for its own terms.
+        vectors: dict[str, dict[str, list]] = {name: {} for name in terms}
+        for field_ref, elements in index['fieldVectors']:
+            for i in range(0, len(elements), 2):
+                name = shard_by_term_index[elements[i]]
+                vectors[name].setdefault(field_ref, []).extend(elements[i : i + 2])
+        term_shards = {}
+        for name, shard_terms in terms.items():
+            path = term_shards[name] = f'shards/terms-{name}.json'
+            files[path] = _dumps(
+                {'invertedIndex': shard_terms, 'fieldVectors': list(vectors[name].items())}
+            )
+
+        # Keep the sections of a page in the same shard.
+        texts: list[list[str]] = []
+        size = _MAX_TEXT_SHARD_SIZE
+        page_url = None
+        for entry in self._entries:
+            url = entry['location'].partition('#')[0]
+            if size >= _MAX_TEXT_SHARD_SIZE and url != page_url:
+                texts.append([])
+                size = 0
+            texts[-1].append(entry['text'])
+            size += len(entry['text'])
+            page_url = url
+        text_shards = []
+        for i, shard_texts in enumerate(texts):
+            path = f'shards/text-{i}.json'
+            text_shards.append({'file': path, 'docs': len(shard_texts)})
+            files[path] = _dumps(shard_texts)
+
+        files['search_index.json'] = _dumps(
+            {
+                'docs': [
+                    {'location': entry['location'], 'title': entry['title']}
+                    for entry in self._entries
+                ],
+                'config': self.config,
+                'shards': {
+                    'version': index['version'],
+                    'fields': index['fields'],
+                    'pipeline': index['pipeline'],
+                    'terms': term_shards,
+                    'text': text_shards,
+                },
+            }
+        )
+        return files
+
+    def _generate(self) -> dict[str, Any]:
+        """Return the documents, the config and the pre-built index, if any."""
+        page_dicts: dict[str, Any] = {'docs': self._entries, 'config': self.config}
+
+        if self.config['prebuild_index'] is True and self.config.get('lang') != ['en']:
+            if other_languages := [lang for lang in self.config.get('lang') or () if lang != 'en']:
+                log.info(
+                    "Pre-building the search index with Node.js, as MkDocs can only pre-build it "
+                    f"for English ('en'), not for the search languages: {', '.join(other_languages)}"
+                )
+        elif self.config['prebuild_index'] is True:
+            try:
+                page_dicts['index'] = lunr_index.build_index(
+                    self._entries, separator=self.config.get('separator')
+                )
+            except re.error as e:
+                log.info(
+                    "Pre-building the search index with Node.js, as the search separator "
+                    f"is not a valid Python regular expression: {e}"
+                )
+            else:
+                log.debug('Pre-built search index created successfully.')
+                return page_dicts
 
         if self.config['prebuild_index'] in (True, 'node'):
             try:
@@ -109,10 +232,14 @@ class SearchIndex:
                     stderr=subprocess.PIPE,
                     encoding='utf-8',
                 )
-                idx, err = p.communicate(data)
+                try:
+                    assert p.stdin is not None
+                    p.stdin.writelines(_iter_json(page_dicts))
+                except BrokenPipeError:
+                    pass  # The error is read from stderr.
+                idx, err = p.communicate()
                 if not err:
                     page_dicts['index'] = json.loads(idx)
-                    data = json.dumps(page_dicts, sort_keys=True, separators=(',', ':'))
                     log.debug('Pre-built search index created successfully.')
                 else:
                     log.warning(f'Failed to pre-build search index. Error: {err}')
@@ -127,7 +254,6 @@ class SearchIndex:
                     languages=self.config['lang'],
                 )
                 page_dicts['index'] = lunr_idx.serialize()
-                data = json.dumps(page_dicts, sort_keys=True, separators=(',', ':'))
             else:
                 log.warning(
                     "Failed to pre-build search index. The 'python' method was specified; "
@@ -136,7 +262,123 @@ class SearchIndex:
                     "other than English you will also need to install 'lunr[languages]'."
                 )
 
-        return data
+        return page_dicts
+
+
+_MAX_TEXT_SHARD_SIZE = 100_000
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _iter_json(obj: Any, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """The same as `_dumps`, in chunks of about `chunk_size` characters."""
+    buffer: list[str] = []
+    size = 0
+    for part in _iter_json_parts(obj):
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _iter_json_parts(obj: Any) -> Iterator[str]:
+    # Dicts are split by keys and lists by items. `json.JSONEncoder.iterencode` would
+    # split everything, but it is much slower as it doesn't use the C encoder.
+    if isinstance(obj, dict):
+        yield '{'
+        for i, key in enumerate(sorted(obj)):
+            yield f'{"," if i else ""}{_dumps(key)}:'
+            yield from _iter_json_parts(obj[key])
+        yield '}'
+    elif isinstance(obj, (list, tuple)):
+        yield '['
+        for i, item in enumerate(obj):
+            yield f',{_dumps(item)}' if i else _dumps(item)
+        yield ']'
+    else:
+        yield _dumps(obj)
+
+
+def _compact(page_dicts: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Return the documents and the pre-built index, if any, in the compact format.
+
+    The documents are stored by column, with tables of the distinct pages and titles. In the index,
+    the terms are listed in the order of their `_index`, and the documents are referred to by their
+    number rather than their location, as deltas. `search/worker.js` expands this back.
+    Return None if the index isn't one that can be expanded back the same.
+    """
+    docs = page_dicts['docs']
+    pages: dict[str, int] = {}
+    titles: dict[str | None, int] = {}
+    doc_numbers: dict[str, int] = {}
+    for i, doc in enumerate(docs):
+        doc_numbers.setdefault(doc['location'], i)
+    result: dict[str, Any] = {
+        'page': [pages.setdefault(doc['location'].partition('#')[0], len(pages)) for doc in docs],
+        'anchor': [''.join(doc['location'].partition('#')[1:]) for doc in docs],
+        'title': [titles.setdefault(doc['title'], len(titles)) for doc in docs],
+        'text': [doc['text'] for doc in docs],
+    }
+    result['pages'] = list(pages)
+    result['titles'] = list(titles)
+
+    index = page_dicts.get('index')
+    if index is None:
+        return result
+    fields = index['fields']
+    term_count = len(index['invertedIndex'])
+    terms: list[str | None] = [None] * term_count
+    postings: list[list[list[int]] | None] = [None] * term_count
+    vectors: list[list[list[float]]] = [[[] for _ in docs] for _ in fields]
+    try:
+        for term, posting in index['invertedIndex']:
+            term_index = posting['_index']
+            if not 0 <= term_index < term_count or terms[term_index] is not None:
+                return None
+            if any(metadata for field in fields for metadata in posting[field].values()):
+                return None
+            terms[term_index] = term
+            postings[term_index] = [
+                _deltas([doc_numbers[ref] for ref in sorted(posting[field])]) for field in fields
+            ]
+        for field_ref, elements in index['fieldVectors']:
+            field, _, ref = field_ref.partition('/')
+            vector = vectors[fields.index(field)][doc_numbers[ref]]
+            vector.extend(elements)
+            vector[0::2] = _deltas(elements[0::2])
+    except (KeyError, ValueError):
+        return None
+    result['index'] = {
+        'version': index['version'],
+        'fields': fields,
+        'pipeline': index['pipeline'],
+        'terms': terms,
+        'postings': postings,
+        'vectors': vectors,
+    }
+    return result
+
+
+def _deltas(numbers: list[int]) -> list[int]:
+    return [n - previous for previous, n in zip([0, *numbers], numbers)]
+
+
+def _term_shard(term: str) -> str:
+    """
+    Return the name of the shard of the search index for the term.
+
+    This is the hex code of the first UTF-16 code unit of the term, or of its block of 256
+    for non-ASCII characters. `search/worker.js` computes the same for the query terms.
+    """
+    code = int.from_bytes(term.encode('utf-16-be', 'surrogatepass')[:2], 'big')
+    return f'{code:x}' if code < 0x80 else f'{code >> 8:x}xx'
 
 
 class ContentSection:
@@ -159,8 +401,40 @@ class ContentSection:
         return self.text == other.text and self.id == other.id and self.title == other.title
 
 
+def _toc_items_by_id(toc: Iterable[AnchorLink]) -> dict[str, AnchorLink]:
+    """Map IDs to the items of the table of contents, with the item `_find_toc_by_id` would find."""
+    items: dict[str, AnchorLink] = {}
+
+    def add(toc: Iterable[AnchorLink]) -> None:
+        for toc_item in toc:
+            items.setdefault(toc_item.id, toc_item)
+            add(toc_item.children)
+
+    add(toc)
+    return items
+
+
 _HEADER_TAGS = tuple(f"h{x}" for x in range(1, 7))
 
+# The tags whose content `HTMLParser` doesn't parse as HTML, in some Python version.
+_RAW_TEXT_TAGS = frozenset(
+    ('script', 'style', 'textarea', 'title', 'xmp', 'iframe', 'noembed', 'noframes', 'noscript')
+)
+
+# A start tag, an end tag, a comment, or else just the `<`. These are a strict subset
+# of what `HTMLParser` accepts, for which it gives the same result in any Python version.
+_MARKUP_RE = re.compile(
+    r"""<(?:
+        ([a-zA-Z][a-zA-Z0-9-]*)
+        ((?:\s+[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`/]+(?=[\s>])))?)*)
+        \s*(/?)>
+      | /([a-zA-Z][a-zA-Z0-9-]*)\s*>
+      | !--(?![->])(?:(?!--).)*-->
+      |)""",
+    re.VERBOSE | re.DOTALL,
+)
+_ATTR_RE = re.compile(r"""([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`/]+)))?""")
+
 
 class ContentParser(HTMLParser):
     """
@@ -223,3 +497,51 @@ class ContentParser(HTMLParser):
     @property
     def stripped_html(self) -> str:
         return '\n'.join(self._stripped_html)
+
+    @classmethod
+    def from_html(cls, html: str) -> ContentParser:
+        """
+        Return a parser that has been fed all of the HTML.
+
+        HTML such as Markdown produces is tokenized with a regex, which is much faster than
+        `HTMLParser`. Anything else, like a `<script>` or a stray `<`, goes through `HTMLParser`.
+        """
+        parser = cls()
+        if not parser._feed_simple_html(html):
+            parser = cls()
+            parser.feed(html)
+            parser.close()
+        return parser
+
+    def _feed_simple_html(self, html: str) -> bool:
+        pos = 0
+        for m in _MARKUP_RE.finditer(html):
+            start = m.start()
+            if start > pos:
+                self.handle_data(unescape(html[pos:start]))
+            pos = m.end()
+            tag, attrs, self_closing, end_tag = m.groups()
+            if tag:
+                tag = tag.lower()
+                if tag in _RAW_TEXT_TAGS:
+                    return False
+                if tag in _HEADER_TAGS:
+                    self.handle_starttag(tag, _parse_attrs(attrs))
+                    if self_closing:
+                        self.handle_endtag(tag)
+            elif end_tag:
+                self.handle_endtag(end_tag.lower())
+            elif pos - start == 1:
+                return False
+        if pos < len(html):
+            self.handle_data(unescape(html[pos:]))
+        return True
+
+
+def _parse_attrs(attrs: str) -> list[tuple[str, str | None]]:
+    result = []
+    for m in _ATTR_RE.finditer(attrs):
+        name, *values = m.groups()
+        value = next((v for v in values if v is not None), None)
+        result.append((name.lower(), None if value is None else unescape(value)))
+    return result
@@ -56,7 +56,7 @@ function doSearch () {
   var query = document.getElementById('mkdocs-search-query').value;
   if (query.length > min_search_length) {
     if (!window.Worker) {
-      displayResults(search(query));
+      searchWhenLoaded(query, displayResults);
     } else {
       searchWorker.postMessage({query: query});
     }
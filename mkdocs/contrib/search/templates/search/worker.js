@@ -35,6 +35,9 @@ function loadScripts(urls, callback) {
 
 function onJSONLoaded () {
   data = JSON.parse(this.responseText);
+  if (data.compact) {
+    expandCompact(data);
+  }
   var scriptsToLoad = ['lunr.js'];
   if (data.config && data.config.lang && data.config.lang.length) {
     lang = data.config.lang;
@@ -56,13 +59,76 @@ function onJSONLoaded () {
   loadScripts(scriptsToLoad, onScriptsLoaded);
 }
 
+// Expand the compact format of the search index (`index_format: compact`)
+// back into the list of documents and the serialized Lunr index.
+function expandCompact (data) {
+  var compact = data.compact;
+  data.docs = compact.text.map(function (text, i) {
+    return {
+      location: compact.pages[compact.page[i]] + compact.anchor[i],
+      title: compact.titles[compact.title[i]],
+      text: text
+    };
+  });
+  if (compact.index) {
+    data.index = expandCompactIndex(compact.index, data.docs);
+  }
+  delete data.compact;
+}
+
+function expandCompactIndex (index, docs) {
+  var fields = index.fields;
+  var invertedIndex = index.terms.map(function (term, i) {
+    var posting = {_index: i};
+    fields.forEach(function (field, f) {
+      var refs = posting[field] = {};
+      var doc = 0;
+      index.postings[i][f].forEach(function (delta) {
+        doc += delta;
+        refs[docs[doc].location] = {};
+      });
+    });
+    return [term, posting];
+  });
+  invertedIndex.sort(function (a, b) {
+    return a[0] < b[0] ? -1 : (a[0] > b[0] ? 1 : 0);
+  });
+  var fieldVectors = [];
+  var seen = Object.create(null);
+  docs.forEach(function (doc, d) {
+    if (seen[doc.location]) {
+      return;
+    }
+    seen[doc.location] = true;
+    fields.forEach(function (field, f) {
+      var elements = index.vectors[f][d].slice();
+      var term = 0;
+      for (var i = 0; i < elements.length; i += 2) {
+        term += elements[i];
+        elements[i] = term;
+      }
+      fieldVectors.push([field + '/' + doc.location, elements]);
+    });
+  });
+  return {
+    version: index.version,
+    fields: fields,
+    fieldVectors: fieldVectors,
+    invertedIndex: invertedIndex,
+    pipeline: index.pipeline
+  };
+}
+
 function onScriptsLoaded () {
   console.log('All search scripts loaded, building Lunr index...');
   if (data.config && data.config.separator && data.config.separator.length) {
     lunr.tokenizer.separator = new RegExp(data.config.separator);
   }
 
-  if (data.index) {
+  if (data.shards) {
+    initShards();
+    console.log('Lunr sharded index loaded, search ready');
+  } else if (data.index) {
     index = lunr.Index.load(data.index);
     data.docs.forEach(function (doc) {
       documents[doc.location] = doc;
@@ -103,6 +169,175 @@ function init () {
   oReq.send();
 }
 
+// The sharded index: the manifest has the titles, and the terms of the
+// pre-built index and the text of the documents are loaded when needed.
+var shards;
+var searchPipeline;
+var shardRequests = {};
+var termEntries = [];
+var fieldVectors = {};
+var indexIsStale = false;
+var textShardOfDoc = {};
+var textShardStart = {};
+var latestQuery;
+
+function initShards () {
+  shards = data.shards;
+  searchPipeline = lunr.Pipeline.load(shards.pipeline);
+  var start = 0;
+  for (var i=0; i < shards.text.length; i++) {
+    var shard = shards.text[i];
+    textShardStart[shard.file] = start;
+    for (var j=start; j < start + shard.docs; j++) {
+      textShardOfDoc[data.docs[j].location] = shard.file;
+    }
+    start += shard.docs;
+  }
+  data.docs.forEach(function (doc) {
+    documents[doc.location] = doc;
+    shards.fields.forEach(function (field) {
+      fieldVectors[field + '/' + doc.location] = [];
+    });
+  });
+  buildShardedIndex();
+}
+
+function buildShardedIndex () {
+  termEntries.sort(function (a, b) {
+    return a[0] < b[0] ? -1 : (a[0] > b[0] ? 1 : 0);
+  });
+  index = lunr.Index.load({
+    version: shards.version,
+    fields: shards.fields,
+    pipeline: shards.pipeline,
+    invertedIndex: termEntries,
+    fieldVectors: Object.keys(fieldVectors).map(function (fieldRef) {
+      return [fieldRef, fieldVectors[fieldRef]];
+    })
+  });
+  indexIsStale = false;
+}
+
+function loadShards (files, merge, callback) {
+  var pending = files.length + 1;
+  function done () {
+    if (--pending === 0) {
+      callback();
+    }
+  }
+  files.forEach(function (file) {
+    var request = shardRequests[file];
+    if (!request) {
+      request = shardRequests[file] = {loaded: false, callbacks: []};
+      var oReq = new XMLHttpRequest();
+      oReq.addEventListener("load", function () {
+        merge(file, JSON.parse(this.responseText));
+        request.loaded = true;
+        request.callbacks.forEach(function (cb) { cb(); });
+      });
+      oReq.addEventListener("error", function () {
+        console.error('Could not load ' + file);
+      });
+      oReq.open("GET", 'function' === typeof importScripts ? file : base_path + file);
+      oReq.send();
+    }
+    if (request.loaded) {
+      done();
+    } else {
+      request.callbacks.push(done);
+    }
+  });
+  done();
+}
+
+// Must match `_term_shard` in `search_index.py`.
+function termShard (term) {
+  var code = term.length ? term.charCodeAt(0) : 0;
+  return code < 0x80 ? code.toString(16) : (code >> 8).toString(16) + 'xx';
+}
+
+function termShardsForQuery (query) {
+  var parsedQuery = new lunr.Query(shards.fields);
+  try {
+    new lunr.QueryParser(query, parsedQuery).parse();
+  } catch (e) {
+    return [];
+  }
+  var files = {};
+  for (var i=0; i < parsedQuery.clauses.length; i++) {
+    var clause = parsedQuery.clauses[i];
+    var terms = clause.usePipeline ? searchPipeline.runString(clause.term, {fields: clause.fields}) : [clause.term];
+    for (var j=0; j < terms.length; j++) {
+      if (clause.editDistance || terms[j].charAt(0) === '*') {
+        // Such terms can match terms with any first character.
+        return Object.keys(shards.terms).map(function (key) { return shards.terms[key]; });
+      }
+      var file = shards.terms[termShard(terms[j])];
+      if (file) {
+        files[file] = true;
+      }
+    }
+  }
+  return Object.keys(files);
+}
+
+function mergeSortedElements (a, b) {
+  var merged = [], i = 0, j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] < b[j]) {
+      merged.push(a[i], a[i+1]);
+      i += 2;
+    } else {
+      merged.push(b[j], b[j+1]);
+      j += 2;
+    }
+  }
+  return merged.concat(a.slice(i), b.slice(j));
+}
+
+function mergeTermShard (file, shard) {
+  for (var i=0; i < shard.invertedIndex.length; i++) {
+    termEntries.push(shard.invertedIndex[i]);
+  }
+  for (var j=0; j < shard.fieldVectors.length; j++) {
+    var fieldRef = shard.fieldVectors[j][0];
+    fieldVectors[fieldRef] = mergeSortedElements(fieldVectors[fieldRef] || [], shard.fieldVectors[j][1]);
+  }
+  indexIsStale = true;
+}
+
+function mergeTextShard (file, texts) {
+  var start = textShardStart[file];
+  for (var i=0; i < texts.length; i++) {
+    data.docs[start + i].text = texts[i];
+  }
+}
+
+function searchWhenLoaded (query, callback) {
+  if (!shards) {
+    callback(search(query));
+    return;
+  }
+  latestQuery = query;
+  loadShards(termShardsForQuery(query), mergeTermShard, function () {
+    if (query !== latestQuery) {
+      return;
+    }
+    if (indexIsStale) {
+      buildShardedIndex();
+    }
+    var textFiles = {};
+    index.search(query).forEach(function (result) {
+      textFiles[textShardOfDoc[result.ref]] = true;
+    });
+    loadShards(Object.keys(textFiles), mergeTextShard, function () {
+      if (query === latestQuery) {
+        callback(search(query));
+      }
+    });
+  });
+}
+
 function search (query) {
   if (!allowSearch) {
     console.error('Assets for search still loading');
@@ -125,7 +360,9 @@ if( 'function' === typeof importScripts ) {
     if (e.data.init) {
       init();
     } else if (e.data.query) {
-      postMessage({ results: search(e.data.query) });
+      searchWhenLoaded(e.data.query, function (results) {
+        postMessage({ results: results });
+      });
     } else {
       console.error("Worker - Unrecognized message: " + e);
     }
@@ -4,7 +4,18 @@ from __future__ import annotations
 
 import logging
 import sys
-from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, MutableMapping, TypeVar, overload
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Literal,
+    MutableMapping,
+    TypeVar,
+    overload,
+)
 
 if sys.version_info >= (3, 10):
     from importlib.metadata import EntryPoint, entry_points
@@ -69,6 +80,16 @@ class BasePlugin(Generic[SomeConfig]):
     supports_multiple_instances: bool = False
     """Set to true in subclasses to declare support for adding the same plugin multiple times."""
 
+    supports_parallel_rendering: bool = False
+    """Set to true in subclasses to declare that the plugin's page events can run in worker processes.
+
+    With `mkdocs build --jobs`, the `on_page_read_source`, `on_page_markdown` and `on_page_content`
+    events are run in separate processes, so any state that these handlers store on the plugin
+    is not seen by the main process. Similarly, templates are rendered in separate processes, so
+    anything that an `on_env` handler adds to the environment must not rely on shared state.
+    If any plugin that handles these events doesn't declare this, the corresponding step is
+    done serially instead."""
+
     def __class_getitem__(cls, config_class: type[Config]):
         """Eliminates the need to write `config_class = FooConfig` when subclassing BasePlugin[FooConfig]."""
         name = f'{cls.__name__}[{config_class.__name__}]'
@@ -322,6 +343,21 @@ class BasePlugin(Generic[SomeConfig]):
         """
         return page
 
+    def on_pre_page_batch(
+        self, pages: list[Page], /, *, config: MkDocsConfig, files: Files
+    ) -> None:
+        """
+        The `pre_page_batch` event is called once with all the pages that are about
+        to be read, before the [`on_pre_page`][] event of each of them. Plugins that
+        can prepare the pages more efficiently all at once can use it instead of
+        `on_pre_page`. The pages should be modified in place.
+
+        Args:
+            pages: list of `mkdocs.structure.pages.Page` instances
+            config: global configuration object
+            files: global files collection
+        """
+
     def on_page_read_source(self, /, *, page: Page, config: MkDocsConfig) -> str | None:
         """
         > DEPRECATED: Instead of this event, prefer one of these alternatives:
@@ -380,6 +416,24 @@ class BasePlugin(Generic[SomeConfig]):
         """
         return html
 
+    def on_page_content_batch(
+        self, pages: list[Page], /, *, config: MkDocsConfig, files: Files
+    ) -> None:
+        """
+        The `page_content_batch` event is called once after the [`on_page_content`][]
+        event of all pages, with all the pages that were rendered, and before the
+        [`on_env`][] event. Plugins that can process the HTML of all pages more
+        efficiently at once (for example to rewrite links) can use it instead of
+        `on_page_content`, by modifying `page.content` of each page in place.
+
+        With `mkdocs build --dirty`, pages that weren't rendered again are not included.
+
+        Args:
+            pages: list of `mkdocs.structure.pages.Page` instances
+            config: global configuration object
+            files: global files collection
+        """
+
     def on_page_context(
         self, context: TemplateContext, /, *, page: Page, config: MkDocsConfig, nav: Navigation
     ) -> TemplateContext | None:
@@ -490,6 +544,23 @@ class CombinedEvent(Generic[P, T]):
         return CombinedEvent(*(f.__get__(instance, owner) for f in self.methods))
 
 
+class EventStats:
+    """The number of calls to the handlers of one plugin for one event, and the time they took."""
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self, calls: int = 0, seconds: float = 0.0) -> None:
+        self.calls = calls
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f"EventStats(calls={self.calls}, seconds={self.seconds})"
+
+
+# Runs the methods of an event: `dispatcher(item, kwargs)`.
+_Dispatcher = Callable[[Any, Dict[str, Any]], Any]
+
+
 class PluginCollection(dict, MutableMapping[str, BasePlugin]):
     """
     A collection of plugins.
@@ -501,10 +572,42 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
 
     _current_plugin: str | None
 
+    stats: dict[tuple[str, str], EventStats] | None = None
+    """
+    The time spent in event handlers, by `(plugin name, event name)`.
+
+    This is `None` unless `enable_stats` was called, so that no time is spent measuring.
+    """
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.events: dict[str, list[Callable]] = {k: [] for k in EVENTS}
         self._event_origins: dict[Callable, str] = {}
+        self._dispatchers: dict[str, tuple[list[Callable], bool, _Dispatcher]] = {}
+
+    def enable_stats(self) -> None:
+        """Start recording the time spent in each plugin's event handlers into `stats`."""
+        if self.stats is None:
+            self.stats = {}
+
+    def add_stats(self, stats: dict[tuple[str, str], EventStats]) -> None:
+        """Add stats that were recorded elsewhere, e.g. in a worker process."""
+        if self.stats is None:
+            return
+        for key, value in stats.items():
+            total = self.stats.setdefault(key, EventStats())
+            total.calls += value.calls
+            total.seconds += value.seconds
+
+    def format_stats(self) -> str:
+        """A table of the recorded `stats`, the slowest first."""
+        lines = [f"{'Plugin':<30} {'Event':<20} {'Calls':>7} {'Seconds':>8}"]
+        items = sorted((self.stats or {}).items(), key=lambda item: item[1].seconds, reverse=True)
+        for (plugin_name, event_name), stats in items:
+            lines.append(
+                f"{plugin_name:<30} {event_name:<20} {stats.calls:>7} {stats.seconds:>8.3f}"
+            )
+        return '\n'.join(lines)
 
     def _register_event(
         self, event_name: str, method: CombinedEvent | Callable, plugin_name: str | None = None
@@ -557,61 +660,113 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
         All other keywords are variables for context, but would not generally
         be modified by the event method.
         """
-        pass_item = item is not None
-        for method in self.events[name]:
-            self._current_plugin = self._event_origins.get(method, '<unknown>')
-            if log.getEffectiveLevel() <= logging.DEBUG:
-                log.debug(f"Running `{name}` event from plugin '{self._current_plugin}'")
-            if pass_item:
-                result = method(item, **kwargs)
-            else:
-                result = method(**kwargs)
-            # keep item if method returned `None`
-            if result is not None:
-                item = result
-        self._current_plugin = None
-        return item
+        methods = self.events[name]
+        if not methods:
+            return item
+        # The dispatcher is compiled again only if the methods of the event were changed
+        # (`events` can also be modified directly) or `stats` were enabled.
+        timed = self.stats is not None
+        cached = self._dispatchers.get(name)
+        if cached is None or cached[1] is not timed or cached[0] != methods:
+            cached = (list(methods), timed, self._compile_event(name, methods, timed))
+            self._dispatchers[name] = cached
+        return cached[2](item, kwargs)
+
+    def _compile_event(self, name: str, methods: list[Callable], timed: bool) -> _Dispatcher:
+        """Create a function that runs the given methods of an event, see `run_event`."""
+        # Look up the origin of each method now rather than on every call.
+        handlers = [(method, self._event_origins.get(method, '<unknown>')) for method in methods]
+
+        def dispatch(item, kwargs):
+            pass_item = item is not None
+            debug = log.isEnabledFor(logging.DEBUG)
+            stats = self.stats if timed else None
+            for method, plugin_name in handlers:
+                self._current_plugin = plugin_name
+                if debug:
+                    log.debug(f"Running `{name}` event from plugin '{plugin_name}'")
+                if stats is not None:
+                    start = time.perf_counter()
+                if pass_item:
+                    result = method(item, **kwargs)
+                else:
+                    result = method(**kwargs)
+                if stats is not None:
+                    event_stats = stats.setdefault((plugin_name, name), EventStats())
+                    event_stats.calls += 1
+                    event_stats.seconds += time.perf_counter() - start
+                # keep item if method returned `None`
+                if result is not None:
+                    item = result
+            self._current_plugin = None
+            return item
+
+        return dispatch
 
     def on_startup(self, *, command: Literal['build', 'gh-deploy', 'serve'], dirty: bool) -> None:
+        if not self.events['startup']:
+            return
         return self.run_event('startup', command=command, dirty=dirty)
 
     def on_shutdown(self) -> None:
+        if not self.events['shutdown']:
+            return
         return self.run_event('shutdown')
 
     def on_serve(
         self, server: LiveReloadServer, *, config: MkDocsConfig, builder: Callable
     ) -> LiveReloadServer:
+        if not self.events['serve']:
+            return server
         return self.run_event('serve', server, config=config, builder=builder)
 
     def on_config(self, config: MkDocsConfig) -> MkDocsConfig:
+        if not self.events['config']:
+            return config
         return self.run_event('config', config)
 
     def on_pre_build(self, *, config: MkDocsConfig) -> None:
+        if not self.events['pre_build']:
+            return
         return self.run_event('pre_build', config=config)
 
     def on_files(self, files: Files, *, config: MkDocsConfig) -> Files:
+        if not self.events['files']:
+            return files
         return self.run_event('files', files, config=config)
 
     def on_nav(self, nav: Navigation, *, config: MkDocsConfig, files: Files) -> Navigation:
+        if not self.events['nav']:
+            return nav
         return self.run_event('nav', nav, config=config, files=files)
 
     def on_env(self, env: jinja2.Environment, *, config: MkDocsConfig, files: Files):
+        if not self.events['env']:
+            return env
         return self.run_event('env', env, config=config, files=files)
 
     def on_post_build(self, *, config: MkDocsConfig) -> None:
+        if not self.events['post_build']:
+            return
         return self.run_event('post_build', config=config)
 
     def on_build_error(self, *, error: Exception) -> None:
+        if not self.events['build_error']:
+            return
         return self.run_event('build_error', error=error)
 
     def on_pre_template(
         self, template: jinja2.Template, *, template_name: str, config: MkDocsConfig
     ) -> jinja2.Template:
+        if not self.events['pre_template']:
+            return template
         return self.run_event('pre_template', template, template_name=template_name, config=config)
 
     def on_template_context(
         self, context: TemplateContext, *, template_name: str, config: MkDocsConfig
     ) -> TemplateContext:
+        if not self.events['template_context']:
+            return context
         return self.run_event(
             'template_context', context, template_name=template_name, config=config
         )
@@ -619,30 +774,56 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
     def on_post_template(
         self, output_content: str, *, template_name: str, config: MkDocsConfig
     ) -> str:
+        if not self.events['post_template']:
+            return output_content
         return self.run_event(
             'post_template', output_content, template_name=template_name, config=config
         )
 
     def on_pre_page(self, page: Page, *, config: MkDocsConfig, files: Files) -> Page:
+        if not self.events['pre_page']:
+            return page
         return self.run_event('pre_page', page, config=config, files=files)
 
+    def on_pre_page_batch(self, pages: list[Page], *, config: MkDocsConfig, files: Files) -> None:
+        if not self.events['pre_page_batch']:
+            return
+        self.run_event('pre_page_batch', pages, config=config, files=files)
+
     def on_page_read_source(self, *, page: Page, config: MkDocsConfig) -> str | None:
+        if not self.events['page_read_source']:
+            return None
         return self.run_event('page_read_source', page=page, config=config)
 
     def on_page_markdown(
         self, markdown: str, *, page: Page, config: MkDocsConfig, files: Files
     ) -> str:
+        if not self.events['page_markdown']:
+            return markdown
         return self.run_event('page_markdown', markdown, page=page, config=config, files=files)
 
     def on_page_content(self, html: str, *, page: Page, config: MkDocsConfig, files: Files) -> str:
+        if not self.events['page_content']:
+            return html
         return self.run_event('page_content', html, page=page, config=config, files=files)
 
+    def on_page_content_batch(
+        self, pages: list[Page], *, config: MkDocsConfig, files: Files
+    ) -> None:
+        if not self.events['page_content_batch']:
+            return
+        self.run_event('page_content_batch', pages, config=config, files=files)
+
     def on_page_context(
         self, context: TemplateContext, *, page: Page, config: MkDocsConfig, nav: Navigation
     ) -> TemplateContext:
+        if not self.events['page_context']:
+            return context
         return self.run_event('page_context', context, page=page, config=config, nav=nav)
 
     def on_post_page(self, output: str, *, page: Page, config: MkDocsConfig) -> str:
+        if not self.events['post_page']:
+            return output
         return self.run_event('post_page', output, page=page, config=config)
 
 
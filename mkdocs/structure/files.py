@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import concurrent.futures
 import enum
 import fnmatch
+import hashlib
 import logging
 import os
 import posixpath
+import re
 import shutil
+import time
 import warnings
 from functools import cached_property
 from pathlib import PurePath, PurePosixPath
@@ -59,6 +63,22 @@ class InclusionLevel(enum.Enum):
         return self.value <= self.NOT_IN_NAV.value
 
 
+def _normalize_uri(path: str) -> str:
+    """Same as `PurePath(path).as_posix()`, but doesn't create a `PurePath` for already normal paths."""
+    if (
+        path
+        and '\\' not in path
+        and ':' not in path  # A drive on Windows.
+        and '//' not in path
+        and '/./' not in path
+        and not path.startswith('./')
+        and not path.endswith(('/', '/.'))
+        and path != '.'
+    ):
+        return path
+    return PurePath(path).as_posix()
+
+
 class Files:
     """A collection of [File][mkdocs.structure.files.File] objects."""
 
@@ -75,7 +95,7 @@ class Files:
 
     def __contains__(self, path: str) -> bool:
         """Soft-deprecated, prefer `get_file_from_path(path) is not None`."""
-        return PurePath(path).as_posix() in self._src_uris
+        return _normalize_uri(path) in self._src_uris
 
     @property
     def src_paths(self) -> dict[str, File]:
@@ -91,8 +111,18 @@ class Files:
         return self._src_uris
 
     def get_file_from_path(self, path: str) -> File | None:
-        """Return a File instance with File.src_uri equal to path."""
-        return self._src_uris.get(PurePath(path).as_posix())
+        """
+        Return a File instance with File.src_uri equal to path.
+
+        The path is normalized first, e.g. `./foo//bar.md` is the same as `foo/bar.md`.
+        If it's already a `src_uri`, `src_uris.get(path)` is the fastest lookup.
+        """
+        return self._src_uris.get(_normalize_uri(path))
+
+    def get_files_from_paths(self, paths: Iterable[str]) -> list[File | None]:
+        """Same as calling `get_file_from_path` for each path."""
+        src_uris = self._src_uris
+        return [src_uris.get(_normalize_uri(path)) for path in paths]
 
     def append(self, file: File) -> None:
         """Add file to the Files collection."""
@@ -102,6 +132,12 @@ class Files:
             )
             del self._src_uris[file.src_uri]
         self._src_uris[file.src_uri] = file
+        self.__dict__.pop('_fingerprint', None)
+        if (categories := self.__dict__.get('_categories')) is not None:
+            for name, files in categories.items():
+                files.pop(file.src_uri, None)
+                if getattr(file, name)():
+                    files[file.src_uri] = file
 
     def remove(self, file: File) -> None:
         """Remove file from Files collection."""
@@ -109,39 +145,100 @@ class Files:
             del self._src_uris[file.src_uri]
         except KeyError:
             raise ValueError(f'{file.src_uri!r} not in collection')
+        self.__dict__.pop('_fingerprint', None)
+        if (categories := self.__dict__.get('_categories')) is not None:
+            for files in categories.values():
+                files.pop(file.src_uri, None)
+
+    @cached_property
+    def _fingerprint(self) -> str:
+        """A digest of the URIs, URLs and inclusion levels of all files. Reset by `append`/`remove`."""
+        digest = hashlib.sha256()
+        for src_uri, file in sorted(self._src_uris.items()):
+            digest.update(f'{src_uri}\0{file.url}\0{file.inclusion.value}\n'.encode())
+        return digest.hexdigest()
+
+    _CATEGORIES = (
+        'is_documentation_page',
+        'is_static_page',
+        'is_media_file',
+        'is_javascript',
+        'is_css',
+    )
+
+    @cached_property
+    def _categories(self) -> dict[str, dict[str, File]]:
+        """The files for which each of the `File.is_*` methods is true. Updated by `append`/`remove`."""
+        categories: dict[str, dict[str, File]] = {name: {} for name in self._CATEGORIES}
+        for src_uri, file in self._src_uris.items():
+            for name, files in categories.items():
+                if getattr(file, name)():
+                    files[src_uri] = file
+        return categories
 
     def copy_static_files(
         self,
         dirty: bool = False,
         *,
         inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included,
+        strategy: str = 'copy',
+        jobs: int = 1,
     ) -> None:
-        """Copy static files from source to destination."""
-        for file in self:
-            if not file.is_documentation_page() and inclusion(file.inclusion):
-                file.copy_file(dirty)
+        """
+        Copy static files from source to destination, see `File.copy_file`.
+
+        With `jobs` greater than 1, files are copied by that many threads. The first error (in the
+        order of the files) is raised, and the files that aren't being copied yet are skipped.
+        """
+        files = [
+            file for file in self if not file.is_documentation_page() and inclusion(file.inclusion)
+        ]
+        if jobs <= 1:
+            for file in files:
+                file.copy_file(dirty, strategy=strategy)
+            return
+
+        # Files with the same destination are copied one after the other, still in order.
+        by_dest: dict[str, list[File]] = {}
+        for file in files:
+            by_dest.setdefault(file.abs_dest_path, []).append(file)
+
+        def copy_files(files: list[File]) -> None:
+            for file in files:
+                file.copy_file(dirty, strategy=strategy)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(copy_files, group) for group in by_dest.values()]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
 
     def documentation_pages(
         self, *, inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included
     ) -> Sequence[File]:
         """Return iterable of all Markdown page file objects."""
-        return [file for file in self if file.is_documentation_page() and inclusion(file.inclusion)]
+        files = self._categories['is_documentation_page'].values()
+        # The inclusion of a file can still change, so it's not part of the index.
+        return [file for file in files if inclusion(file.inclusion)]
 
     def static_pages(self) -> Sequence[File]:
         """Return iterable of all static page file objects."""
-        return [file for file in self if file.is_static_page()]
+        return list(self._categories['is_static_page'].values())
 
     def media_files(self) -> Sequence[File]:
         """Return iterable of all file objects which are not documentation or static pages."""
-        return [file for file in self if file.is_media_file()]
+        return list(self._categories['is_media_file'].values())
 
     def javascript_files(self) -> Sequence[File]:
         """Return iterable of all javascript file objects."""
-        return [file for file in self if file.is_javascript()]
+        return list(self._categories['is_javascript'].values())
 
     def css_files(self) -> Sequence[File]:
         """Return iterable of all CSS file objects."""
-        return [file for file in self if file.is_css()]
+        return list(self._categories['is_css'].values())
 
     def add_files_from_theme(self, env: jinja2.Environment, config: MkDocsConfig) -> None:
         """Retrieve static files from Jinja environment and add to collection."""
@@ -176,6 +273,8 @@ class Files:
     def _files(self, value: Iterable[File]):
         warnings.warn("Do not access Files._files.", DeprecationWarning)
         self._src_uris = {f.src_uri: f for f in value}
+        self.__dict__.pop('_fingerprint', None)
+        self.__dict__.pop('_categories', None)
 
 
 class File:
@@ -470,22 +569,34 @@ class File:
         self._content = value
         self.abs_src_path = None
 
-    def copy_file(self, dirty: bool = False) -> None:
-        """Copy source file to destination, ensuring parent directories exist."""
+    def copy_file(self, dirty: bool = False, *, strategy: str = 'copy') -> None:
+        """
+        Copy source file to destination, ensuring parent directories exist.
+
+        See `mkdocs.utils.copy_file` for the `strategy`. Unless it is 'copy', a destination which
+        already has the source's size and modification time is left alone.
+        """
         if dirty and not self.is_modified():
             log.debug(f"Skip copying unmodified file: '{self.src_uri}'")
             return
         log.debug(f"Copying media file: '{self.src_uri}'")
         output_path = self.abs_dest_path
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         content = self._content
         if content is None:
             assert self.abs_src_path is not None
             try:
-                utils.copy_file(self.abs_src_path, output_path)
+                # This creates the parent directories only if they're missing.
+                utils.copy_file(
+                    self.abs_src_path,
+                    output_path,
+                    strategy=strategy,
+                    skip_unchanged=strategy != 'copy',
+                )
             except shutil.SameFileError:
                 pass  # Let plugins write directly into site_dir.
-        elif isinstance(content, str):
+            return
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if isinstance(content, str):
             with open(output_path, 'w', encoding='utf-8') as output_file:
                 output_file.write(content)
         else:
@@ -526,32 +637,99 @@ _default_exclude = pathspec.gitignore.GitIgnoreSpec.from_lines(['.*', '/template
 
 def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
     """Re-calculate which files are excluded, based on the patterns in the config."""
-    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
-    exclude = _default_exclude + exclude if exclude else _default_exclude
-    drafts: pathspec.gitignore.GitIgnoreSpec | None = config.get('draft_docs')
-    nav_exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('not_in_nav')
-
+    matcher = _InclusionMatcher.get(config)
     for file in files:
         if file.inclusion == InclusionLevel.UNDEFINED:
-            if exclude.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.EXCLUDED
-            elif drafts and drafts.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.DRAFT
-            elif nav_exclude and nav_exclude.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.NOT_IN_NAV
-            else:
-                file.inclusion = InclusionLevel.INCLUDED
+            file.inclusion = matcher.get_level(file.src_uri)
+
+
+def _spec_key(spec: pathspec.PathSpec | None) -> tuple | None:
+    if spec is None:
+        return None
+    return tuple((p.regex.pattern if p.regex else None, p.include) for p in spec.patterns)
+
+
+def _literal_prefix(pattern: str) -> str:
+    """The path that every match of a gitignore pattern starts with ('' if it can be anywhere)."""
+    pattern = pattern.lstrip('!').rstrip('/')
+    if '/' not in pattern:
+        return ''  # Matches at any depth.
+    return re.split(r'[*?[\\]', pattern.lstrip('/'), maxsplit=1)[0]
+
+
+class _InclusionMatcher:
+    """
+    Matches paths against `exclude_docs`, `draft_docs` and `not_in_nav`.
+
+    The matcher for the last seen patterns is kept between builds in one process, along with the
+    level of each file it has matched.
+    """
+
+    _last: _InclusionMatcher | None = None
+
+    def __init__(
+        self,
+        exclude: pathspec.gitignore.GitIgnoreSpec,
+        drafts: pathspec.gitignore.GitIgnoreSpec | None,
+        nav_exclude: pathspec.gitignore.GitIgnoreSpec | None,
+    ) -> None:
+        self.exclude = exclude
+        self.drafts = drafts
+        self.nav_exclude = nav_exclude
+        self.key = (_spec_key(exclude), _spec_key(drafts), _spec_key(nav_exclude))
+        # The paths that negated patterns can include again, even inside an excluded directory.
+        self._reach = {
+            _literal_prefix(p.pattern)
+            for p in exclude.patterns
+            if p.include is False and isinstance(p.pattern, str)
+        }
+        self._levels: dict[str, InclusionLevel] = {}
+
+    @classmethod
+    def get(cls, config: MkDocsConfig) -> _InclusionMatcher:
+        exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
+        exclude = _default_exclude + exclude if exclude else _default_exclude
+        matcher = cls(exclude, config.get('draft_docs'), config.get('not_in_nav'))
+        if cls._last is None or cls._last.key != matcher.key:
+            cls._last = matcher
+        return cls._last
+
+    def get_level(self, src_uri: str) -> InclusionLevel:
+        try:
+            return self._levels[src_uri]
+        except KeyError:
+            pass
+        if self.exclude.match_file(src_uri):
+            level = InclusionLevel.EXCLUDED
+        elif self.drafts and self.drafts.match_file(src_uri):
+            level = InclusionLevel.DRAFT
+        elif self.nav_exclude and self.nav_exclude.match_file(src_uri):
+            level = InclusionLevel.NOT_IN_NAV
+        else:
+            level = InclusionLevel.INCLUDED
+        self._levels[src_uri] = level
+        return level
+
+    def is_dir_excluded(self, dir_uri: str) -> bool:
+        """
+        Whether every file in the directory (a path relative to docs_dir) is excluded, so that
+        they don't need to be matched one by one.
+        """
+        if not self.exclude.match_file(dir_uri + '/'):
+            return False
+        prefix = dir_uri + '/'
+        return not any(p.startswith(prefix) or prefix.startswith(p) for p in self._reach)
 
 
 def get_files(config: MkDocsConfig) -> Files:
     """Walk the `docs_dir` and return a Files collection."""
     files: list[File] = []
     conflicting_files: list[tuple[File, File]] = []
-    for source_dir, dirnames, filenames in os.walk(config['docs_dir'], followlinks=True):
-        relative_dir = os.path.relpath(source_dir, config['docs_dir'])
-        dirnames.sort()
-        filenames.sort(key=_file_sort_key)
-
+    matcher = _InclusionMatcher.get(config)
+    snapshot = _DirectorySnapshot.get(config['docs_dir'])
+    # The files of directories that are excluded as a whole aren't matched one by one.
+    for relative_dir, filenames, is_excluded in snapshot.walk(excluded=matcher.is_dir_excluded):
+        inclusion = InclusionLevel.EXCLUDED if is_excluded else InclusionLevel.UNDEFINED
         files_by_dest: dict[str, File] = {}
         for filename in filenames:
             file = File(
@@ -559,6 +737,7 @@ def get_files(config: MkDocsConfig) -> Files:
                 config['docs_dir'],
                 config['site_dir'],
                 config['use_directory_urls'],
+                inclusion=inclusion,
             )
             # Skip README.md if an index file also exists in dir (part 1)
             prev_file = files_by_dest.setdefault(file.dest_uri, file)
@@ -588,6 +767,84 @@ def get_files(config: MkDocsConfig) -> Files:
     return Files(files)
 
 
+class _DirectorySnapshot:
+    """
+    The listing of all directories in `docs_dir`, which is kept between builds in one process.
+
+    A directory is only listed again if its modification time has changed since.
+    """
+
+    _last: _DirectorySnapshot | None = None
+
+    # Changes within this time of the listing might not have changed the modification time, given
+    # the coarse timestamps of some file systems. Such directories are always listed again.
+    _racy_ns = 2 * 10**9
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        # Relative path -> (mtime, listing time, sorted subdirectory names, sorted file names).
+        self._listings: dict[str, tuple[int, int, list[str], list[str]]] = {}
+
+    @classmethod
+    def get(cls, root: str) -> _DirectorySnapshot:
+        root = os.path.abspath(root)
+        if cls._last is None or cls._last.root != root:
+            cls._last = cls(root)
+        return cls._last
+
+    def walk(
+        self, excluded: Callable[[str], bool] | None = None
+    ) -> Iterator[tuple[str, list[str], bool]]:
+        """
+        Yield the path of each directory relative to the root (in the same order as `os.walk`,
+        following symlinks), with the names of its files sorted by `_file_sort_key`.
+
+        The last item is whether `excluded` returned True for the POSIX path of the directory or
+        of one of its parents. It isn't called again for the subdirectories of such a directory.
+        """
+        listings: dict[str, tuple[int, int, list[str], list[str]]] = {}
+        pending = [(os.curdir, False)]
+        while pending:
+            relative_dir, is_excluded = pending.pop()
+            path = self.root if relative_dir == os.curdir else os.path.join(self.root, relative_dir)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                listing = self._listings.get(relative_dir)
+                if listing is None or listing[0] != mtime or mtime + self._racy_ns > listing[1]:
+                    listing = self._list(path, mtime)
+            except OSError:
+                continue  # Like `os.walk`, skip directories that can't be listed.
+            listings[relative_dir] = listing
+            _, _, dirnames, filenames = listing
+            yield relative_dir, filenames, is_excluded
+            for name in reversed(dirnames):
+                path = name if relative_dir == os.curdir else os.path.join(relative_dir, name)
+                pending.append(
+                    (
+                        path,
+                        is_excluded
+                        or (excluded is not None and excluded(PurePath(path).as_posix())),
+                    )
+                )
+        self._listings = listings
+
+    @staticmethod
+    def _list(path: str, mtime: int) -> tuple[int, int, list[str], list[str]]:
+        listed = time.time_ns()
+        dirnames: list[str] = []
+        filenames: list[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirnames if is_dir else filenames).append(entry.name)
+        dirnames.sort()
+        filenames.sort(key=_file_sort_key)
+        return mtime, listed, dirnames, filenames
+
+
 def file_sort_key(f: File, /):
     """
     Replicates the sort order how `get_files` produces it - index first, directories last.
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 import enum
+import hashlib
+import json
 import logging
+import os
 import posixpath
+import tempfile
 import warnings
-from typing import TYPE_CHECKING, Any, Callable, Iterator, MutableMapping, Sequence
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterator,
+    MutableMapping,
+    Sequence,
+    Tuple,
+)
 from urllib.parse import unquote as urlunquote
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
@@ -15,11 +29,13 @@ import markdown.postprocessors
 import markdown.treeprocessors
 from markdown.util import AMP_SUBSTITUTE
 
+import mkdocs
 from mkdocs import utils
 from mkdocs.structure import StructureItem
 from mkdocs.structure.toc import get_toc
 from mkdocs.utils import _removesuffix, get_build_date, get_markdown_title, meta, weak_property
 from mkdocs.utils.rendering import get_heading_text
+from mkdocs.utils.yaml import RelativeDirPlaceholder
 
 if TYPE_CHECKING:
     from xml.etree import ElementTree as etree
@@ -265,31 +281,47 @@ class Page(StructureItem):
         if self.markdown is None:
             raise RuntimeError("`markdown` field hasn't been set (via `read_source`)")
 
-        md = markdown.Markdown(
-            extensions=config['markdown_extensions'],
-            extension_configs=config['mdx_configs'] or {},
-        )
-
-        raw_html_ext = _RawHTMLPreprocessor()
-        raw_html_ext._register(md)
-
-        extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
-        extract_anchors_ext._register(md)
-
-        relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
-        relative_path_ext._register(md)
-
-        extract_title_ext = _ExtractTitleTreeprocessor()
-        extract_title_ext._register(md)
-
-        self.content = md.convert(self.markdown)
-        self.toc = get_toc(getattr(md, 'toc_tokens', []))
-        self._title_from_render = extract_title_ext.title
+        cache = None
+        if cache_dir := config.get('cache_dir'):
+            cache = _RenderCache(cache_dir, self, config, files)
+            if cache.load(self, files):
+                return
+
+        renderer = _MarkdownRenderer.get(self.file, files, config)
+
+        # Warnings about the page have to be reported again whenever the cached result is used.
+        capture = utils.CaptureHandler()
+        if cache is not None:
+            logging.getLogger('mkdocs').addHandler(capture)
+        renderer.in_use = True
+        try:
+            self.content = renderer.md.convert(self.markdown)
+        finally:
+            renderer.in_use = False
+            logging.getLogger('mkdocs').removeHandler(capture)
+        toc_tokens = getattr(renderer.md, 'toc_tokens', [])
+        self.toc = get_toc(toc_tokens)
+        self._title_from_render = renderer.extract_title.title
         self.present_anchor_ids = (
-            extract_anchors_ext.present_anchor_ids | raw_html_ext.present_anchor_ids
+            renderer.extract_anchors.present_anchor_ids | renderer.raw_html.present_anchor_ids
         )
         if log.getEffectiveLevel() > logging.DEBUG:
-            self.links_to_anchors = relative_path_ext.links_to_anchors
+            self.links_to_anchors = renderer.relative_path.links_to_anchors
+        self._link_targets = renderer.relative_path.link_targets
+
+        if cache is not None:
+            cache.save(
+                content=self.content,
+                toc_tokens=toc_tokens,
+                title=self._title_from_render,
+                present_anchor_ids=sorted(self.present_anchor_ids),
+                links_to_anchors={
+                    file.src_uri: links
+                    for file, links in renderer.relative_path.links_to_anchors.items()
+                },
+                link_targets=sorted(self._link_targets),
+                logs=[(r.name, r.levelno, r.msg) for r in capture.pop_records()],
+            )
 
     present_anchor_ids: set[str] | None = None
     """Anchor IDs that this page contains (can be linked to in this page)."""
@@ -301,6 +333,9 @@ class Page(StructureItem):
     Populated after `.render()`. Populated only if `validation: {anchors: info}` (or greater) is set.
     """
 
+    _link_targets: Collection[str] = ()
+    """The paths that the links in this page were looked up at (whether they exist or not)."""
+
     def validate_anchor_links(self, *, files: Files, log_level: int) -> None:
         if not self.links_to_anchors:
             return
@@ -326,6 +361,163 @@ class Page(StructureItem):
                 )
 
 
+# Before Markdown 3.7, `Markdown.reset` doesn't clear all the state of the extensions of a
+# document, e.g. `abbr` keeps the abbreviations of every page it has rendered.
+_RESET_CLEARS_EXTENSIONS = markdown.__version_info__ >= (3, 7)
+
+
+class _MarkdownRenderer:
+    """
+    A configured `markdown.Markdown` instance together with MkDocs' own processors.
+
+    Loading all the extensions is expensive, so the same instance is reused for all pages that are
+    rendered with the same config (see `get`). It gets reset and pointed at each page in turn.
+    """
+
+    def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
+        self.extensions = list(config['markdown_extensions'])
+        self.extension_configs = config['mdx_configs'] or {}
+        self.md = markdown.Markdown(
+            extensions=self.extensions, extension_configs=self.extension_configs
+        )
+
+        self.raw_html = _RawHTMLPreprocessor()
+        self.raw_html._register(self.md)
+
+        self.extract_anchors = _ExtractAnchorsTreeprocessor(file, files, config)
+        self.extract_anchors._register(self.md)
+
+        self.relative_path = _RelativePathTreeprocessor(file, files, config)
+        self.relative_path._register(self.md)
+
+        self.extract_title = _ExtractTitleTreeprocessor()
+        self.extract_title._register(self.md)
+
+        self.in_use = False
+        # Extensions may resolve a `!relative` path only once, when they are instantiated.
+        self.reusable = _RESET_CLEARS_EXTENSIONS and not _contains_relative_dir(
+            self.extension_configs
+        )
+
+    def bind(self, file: File, files: Files, config: MkDocsConfig) -> None:
+        """Clear all state left over from the previous page and prepare to render `file`."""
+        self.md.reset()
+        self.raw_html.present_anchor_ids = set()
+        self.extract_anchors.present_anchor_ids = set()
+        self.relative_path.file = file
+        self.relative_path.files = files
+        self.relative_path.config = config
+        self.relative_path.links_to_anchors = {}
+        self.relative_path.link_targets = set()
+        self.extract_title.title = None
+
+    _cached: tuple[weakref.ref[MkDocsConfig], _MarkdownRenderer] | None = None
+
+    @classmethod
+    def get(cls, file: File, files: Files, config: MkDocsConfig) -> _MarkdownRenderer:
+        """Return the renderer for this config, creating it only if the extensions have changed."""
+        if cls._cached is not None:
+            config_ref, renderer = cls._cached
+            if (
+                config_ref() is config
+                and renderer.reusable
+                and not renderer.in_use  # A nested call to `Page.render`, e.g. from a plugin.
+                and renderer.extensions == config['markdown_extensions']
+                and renderer.extension_configs == (config['mdx_configs'] or {})
+            ):
+                renderer.bind(file, files, config)
+                return renderer
+        renderer = cls(file, files, config)
+        if cls._cached is None or not cls._cached[1].in_use:
+            cls._cached = (weakref.ref(config), renderer)
+        return renderer
+
+
+def _contains_relative_dir(value: object) -> bool:
+    if isinstance(value, RelativeDirPlaceholder):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_relative_dir(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_relative_dir(v) for v in value)
+    return False
+
+
+def _json_default(obj: object) -> str:
+    # Functions and classes (e.g. a custom `slugify` in `mdx_configs`) are identified by their import path.
+    if hasattr(obj, '__module__') and hasattr(obj, '__qualname__'):
+        return f'{obj.__module__}.{obj.__qualname__}'
+    return repr(obj)
+
+
+class _RenderCache:
+    """Stores the results of `Page.render` in `cache_dir`, keyed by everything that can affect them."""
+
+    def __init__(self, cache_dir: str, page: Page, config: MkDocsConfig, files: Files) -> None:
+        key = {
+            'mkdocs': mkdocs.__version__,
+            'markdown': markdown.__version__,
+            'markdown_extensions': config['markdown_extensions'],
+            'mdx_configs': config['mdx_configs'],
+            'use_directory_urls': config['use_directory_urls'],
+            'validation': dict(config['validation']['links']),
+            'log_level': log.getEffectiveLevel(),
+            'files': files._fingerprint,
+            'src_uri': page.file.src_uri,
+            'url': page.file.url,
+            'inclusion': page.file.inclusion.value,
+            'source': page.markdown,
+        }
+        serialized = json.dumps(key, sort_keys=True, default=_json_default)
+        digest = hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+        self.path = os.path.join(cache_dir, 'pages', digest[:2], f'{digest}.json')
+
+    def load(self, page: Page, files: Files) -> bool:
+        """Populate the page from the cache. Returns False if there is no usable entry."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            links_to_anchors = {}
+            for src_uri, links in data['links_to_anchors'].items():
+                target = page.file if src_uri == page.file.src_uri else files.src_uris.get(src_uri)
+                if target is None:
+                    return False
+                links_to_anchors[target] = links
+            content, toc_tokens, title = data['content'], data['toc_tokens'], data['title']
+            present_anchor_ids, link_targets = data['present_anchor_ids'], data['link_targets']
+            logs = data['logs']
+        except (KeyError, AttributeError):  # Written by a different version.
+            return False
+
+        for name, levelno, msg in logs:
+            logging.getLogger(name).log(levelno, msg)
+
+        page.content = content
+        page.toc = get_toc(toc_tokens)
+        page._title_from_render = title
+        page.present_anchor_ids = set(present_anchor_ids)
+        if log.getEffectiveLevel() > logging.DEBUG:
+            page.links_to_anchors = links_to_anchors
+        page._link_targets = set(link_targets)
+        return True
+
+    def save(self, **data: Any) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Write to a temporary file first, so that concurrent builds never see a partial entry.
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=os.path.dirname(self.path), delete=False
+            ) as f:
+                json.dump(data, f)
+            os.replace(f.name, self.path)
+        except OSError as e:
+            log.debug(f"Couldn't write to the render cache: {e}")
+
+
 class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.present_anchor_ids: set[str] = set()
@@ -343,12 +535,32 @@ class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
         md.treeprocessors.register(self, "mkdocs_extract_anchors", priority=5)  # Same as 'toc'.
 
 
+# (directory of the source file, link) -> (target URI, target file, query, anchor)
+_ResolvedLinks = MutableMapping[Tuple[str, str], Tuple[str, 'File', str, str]]
+
+
 class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.file = file
         self.files = files
         self.config = config
         self.links_to_anchors: dict[File, dict[str, str]] = {}
+        self.link_targets: set[str] = set()
+
+    _resolved_links: tuple[weakref.ref[Files], str, _ResolvedLinks] | None = None
+    """The relative links that were resolved to a file, shared by all pages that use the same `Files`."""
+
+    _MAX_RESOLVED_LINKS = 100_000
+
+    def _get_resolved_links(self) -> _ResolvedLinks:
+        fingerprint = self.files._fingerprint
+        cached = _RelativePathTreeprocessor._resolved_links
+        if cached is None or cached[0]() is not self.files or cached[1] != fingerprint:
+            cached = (weakref.ref(self.files), fingerprint, {})
+            _RelativePathTreeprocessor._resolved_links = cached
+        elif len(cached[2]) >= self._MAX_RESOLVED_LINKS:
+            cached[2].clear()
+        return cached[2]
 
     def run(self, root: etree.Element) -> etree.Element:
         """
@@ -416,7 +628,19 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
                     yield guess
                     tried.add(guess)
 
+    def _get_file(self, path: str) -> File | None:
+        # Remember every lookup, so that the page can be rendered again if any of the targets change.
+        self.link_targets.add(path)
+        return self.files.get_file_from_path(path)
+
     def path_to_url(self, url: str) -> str:
+        # A link that was already resolved from another page in the same directory.
+        resolved_links = self._get_resolved_links()
+        key = (posixpath.dirname(self.file.src_uri), url)
+        if (resolved := resolved_links.get(key)) is not None:
+            self.link_targets.add(resolved[0])
+            return self._link_to_file(url, *resolved)
+
         scheme, netloc, path, query, anchor = urlsplit(url)
 
         absolute_link = None
@@ -451,7 +675,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         else:
             # Validate that the target exists in files collection.
             target_uri = next(possible_target_uris)
-            target_file = self.files.get_file_from_path(target_uri)
+            target_file = self._get_file(target_uri)
 
         if target_file is None and not warning:
             # Primary lookup path had no match, definitely produce a warning, just choose which one.
@@ -478,7 +702,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
             if warning_level > logging.DEBUG:
                 suggest_url = ''
                 for path in possible_target_uris:
-                    if self.files.get_file_from_path(path) is not None:
+                    if self._get_file(path) is not None:
                         if anchor and path == self.file.src_uri:
                             path = ''
                         elif absolute_link is _AbsoluteLinksValidationValue.RELATIVE_TO_DOCS:
@@ -498,6 +722,13 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         assert target_uri is not None
         assert target_file is not None
 
+        if absolute_link is None:
+            resolved_links[key] = (target_uri, target_file, query, anchor)
+        return self._link_to_file(url, target_uri, target_file, query, anchor)
+
+    def _link_to_file(
+        self, url: str, target_uri: str, target_file: File, query: str, anchor: str
+    ) -> str:
         if anchor:
             # Register that this page links to the target file with an anchor.
             self.links_to_anchors.setdefault(target_file, {}).setdefault(anchor, url)
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import contextlib
 import io
+import json
 import os.path
 import re
 import textwrap
@@ -13,14 +14,17 @@ from unittest import mock
 
 import markdown.preprocessors
 
+from mkdocs import utils
 from mkdocs.commands import build
 from mkdocs.config import base
-from mkdocs.exceptions import PluginError
+from mkdocs.exceptions import Abort, PluginError
+from mkdocs.plugins import BasePlugin
 from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import get_navigation
 from mkdocs.structure.pages import Page
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
 from mkdocs.utils import meta
+from mkdocs.utils.profiling import Profiler
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -207,6 +211,24 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
             "That will be unsupported in a future release. Please change it to '/'.",
         )
 
+    def test_context_extra_css_js_shared_between_pages(self):
+        extra_css = ['css/style.css', 'css/sub/sub.css', '../up.css', 'https://example.com/x.css']
+        cfg = load_config(extra_css=extra_css)
+        fs = [
+            File(path, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for path in ['index.md', 'a/x.md', 'b/y.md', 'css/z.md', 'css/sub/w.md']
+        ]
+        files = Files(fs)
+        nav = get_navigation(files, cfg)
+        contexts = [build.get_context(nav, files, cfg, page) for page in nav.pages]
+        for page, context in zip(nav.pages, contexts):
+            with self.subTest(page=page.url):
+                expected = [utils.normalize_url(path, page) for path in extra_css]
+                self.assertEqual(context['extra_css'], expected)
+        self.assertEqual(contexts[1]['extra_css'], contexts[2]['extra_css'])
+        self.assertIsNot(contexts[1]['extra_css'], contexts[2]['extra_css'])
+        self.assertIs(contexts[0]['build_date_utc'], contexts[1]['build_date_utc'])
+
     def test_context_extra_css_js_no_page(self):
         cfg = load_config(extra_css=['style.css'], extra_javascript=['script.js'])
         context = build.get_context(mock.Mock(), mock.Mock(), cfg, base_url='..')
@@ -620,6 +642,20 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
 
             self.assertPathNotExists(site_dir, '.zoo.html')
 
+    @tempdir(files={'index.md': 'page content, [x](drafts/x.md)', 'drafts/x.md': 'draft'})
+    @tempdir()
+    def test_link_into_excluded_dir(self, site_dir, docs_dir):
+        cfg = load_config(
+            docs_dir=docs_dir, site_dir=site_dir, exclude_docs='drafts/\n', strict=True
+        )
+        expected_logs = '''
+            INFO:Doc file 'index.md' contains a link to 'drafts/x.md' which is excluded from the built site.
+        '''
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg)
+        self.assertPathIsFile(site_dir, 'index.html')
+        self.assertPathNotExists(site_dir, 'drafts')
+
     @tempdir(
         files={
             'foo/README.md': 'page1 content',
@@ -807,6 +843,411 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
                     else:
                         self.assertPathExists(summary_path)
 
+    @tempdir(
+        files={
+            'index.md': '# Welcome\n\n[foo](foo.md#bar)',
+            'foo.md': '# Foo\n\n## Baz\n\n[nonexistent](nonexistent.md)',
+            'sub/other.md': 'no title, [index](../index.md)',
+        }
+    )
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_build_with_jobs(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, use_directory_urls=False)
+        expected_logs = """
+            WARNING:Doc file 'foo.md' contains a link 'nonexistent.md', but the target is not found among documentation files.
+            INFO:Doc file 'index.md' contains a link 'foo.md#bar', but the doc 'foo.md' does not contain an anchor '#bar'.
+        """
+        outputs = []
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg, jobs=jobs)
+                outputs.append(
+                    {
+                        path: Path(site_dir, path).read_text()
+                        for path in ('index.html', 'foo.html', 'sub/other.html')
+                    }
+                )
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn('<title>Foo - Example</title>', outputs[1]['foo.html'])
+        self.assertIn('href="#baz"', outputs[1]['foo.html'])
+
+    @tempdir(files={'a.md': 'page a', 'b.md': 'page b', 'c.md': 'page c'})
+    @tempdir()
+    def test_build_with_jobs_post_page_in_order(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, nav=['c.md', 'a.md', 'b.md'])
+        seen = []
+
+        def on_post_page(output, page, **kwargs):
+            seen.append(page.file.src_uri)
+            return output.replace('<p>page', '<p>modified page')
+
+        cfg.plugins.events['post_page'].append(on_post_page)
+        build.build(cfg, jobs=2)
+        self.assertEqual(seen, ['a.md', 'b.md', 'c.md'])
+        self.assertIn('<p>modified page b</p>', Path(site_dir, 'b', 'index.html').read_text())
+
+    @tempdir(files={'a.md': 'page a', 'b.md': 'page b', 'c.md': 'page c'})
+    @tempdir()
+    def test_build_page_batch_events(self, site_dir, docs_dir):
+        calls = []
+
+        def on_pre_page_batch(pages, **kwargs):
+            calls.append(('pre_page_batch', [page.content for page in pages]))
+
+        def on_page_content_batch(pages, **kwargs):
+            calls.append(('page_content_batch', [page.content for page in pages]))
+            for page in pages:
+                page.content = page.content.replace('<p>page', '<p>modified page')
+
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                calls.clear()
+                cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+                cfg.plugins.events['pre_page_batch'].append(on_pre_page_batch)
+                cfg.plugins.events['page_content_batch'].append(on_page_content_batch)
+                build.build(cfg, jobs=jobs)
+                self.assertEqual(
+                    calls,
+                    [
+                        ('pre_page_batch', [None, None, None]),
+                        ('page_content_batch', ['<p>page a</p>', '<p>page b</p>', '<p>page c</p>']),
+                    ],
+                )
+                self.assertIn(
+                    '<p>modified page b</p>', Path(site_dir, 'b', 'index.html').read_text()
+                )
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir()
+    def test_build_with_jobs_unsafe_plugin(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        seen = []
+        cfg.plugins.events['page_markdown'].append(lambda markdown, page, **kw: seen.append(page))
+
+        expected_logs = """
+            INFO:Rendering pages serially because these plugins don't declare `supports_parallel_rendering`: <unknown>
+        """
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg, jobs=2)
+        # The event ran in this process.
+        self.assertEqual(len(seen), 1)
+
+    @tempdir(files={'a.md': 'page a', 'b.md': 'page b', 'c.md': 'page c'})
+    @tempdir()
+    def test_build_with_jobs_plugin_stats(self, site_dir, docs_dir):
+        class Plugin(BasePlugin):
+            supports_parallel_rendering = True
+
+            def on_page_markdown(self, markdown, **kwargs):
+                return markdown
+
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+                cfg.plugins['sample'] = Plugin()
+                cfg.plugins.enable_stats()
+                build.build(cfg, jobs=jobs)
+                assert cfg.plugins.stats is not None
+                self.assertEqual(cfg.plugins.stats[('sample', 'page_markdown')].calls, 3)
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\n[b](b.md#sec) [c](c.md)',
+            'a.md': '# A\n\ntext',
+            'b.md': '# B\n\n## Sec',
+        }
+    )
+    @tempdir()
+    def test_build_dirty_incremental(self, site_dir, docs_dir):
+        pages = ['index.html', 'a/index.html', 'b/index.html']
+
+        def load():
+            # Like `mkdocs serve`, which loads the config again for each build.
+            return load_config(docs_dir=docs_dir, site_dir=site_dir, plugins=['search'])
+
+        def dirty_build():
+            render = mock.patch.object(Page, 'render', autospec=True, side_effect=Page.render)
+            write_file = mock.patch('mkdocs.utils.write_file', wraps=utils.write_file)
+            with render as render, write_file as write_file, self.assertLogs('mkdocs') as cm:
+                build.build(load(), dirty=True)
+            rendered = [call.args[0].file.src_uri for call in render.call_args_list]
+            written = [
+                Path(call.args[1]).relative_to(site_dir).as_posix()
+                for call in write_file.call_args_list
+            ]
+            messages = [r.getMessage() for r in cm.records]
+            return rendered, [path for path in pages if path in written], messages
+
+        # A dirty build of an empty site_dir builds everything, and records it for the next one.
+        with self.assertLogs('mkdocs'):
+            build.build(load(), dirty=True)
+        search_index = Path(site_dir, 'search', 'search_index.json')
+        search_docs = json.loads(search_index.read_text())['docs']
+
+        # Only the content of one page changed.
+        Path(docs_dir, 'a.md').write_text('# A\n\nnew text')
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, ['a.md'])
+        self.assertEqual(written, ['a/index.html'])
+        self.assertTrue(
+            any(m.startswith('Rebuilding only the pages affected by changes') for m in messages)
+        )
+        self.assertIn('<p>new text</p>', Path(site_dir, 'a', 'index.html').read_text())
+        # The search plugin still sees all the pages.
+        new_search_docs = json.loads(search_index.read_text())['docs']
+        self.assertEqual(
+            [doc['location'] for doc in new_search_docs], [doc['location'] for doc in search_docs]
+        )
+        self.assertIn('new text', str(new_search_docs))
+
+        # The title is shown in the nav of all pages.
+        Path(docs_dir, 'a.md').write_text('# Changed title\n\nnew text')
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, ['a.md'])
+        self.assertEqual(written, pages)
+        self.assertIn('Changed title', Path(site_dir, 'b', 'index.html').read_text())
+
+        # Anchors are still validated for the pages that weren't rendered again.
+        Path(docs_dir, 'b.md').write_text('# B\n\n## Other')
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, ['b.md'])
+        self.assertEqual(written, ['b/index.html'])
+        self.assertIn(
+            "Doc file 'index.md' contains a link 'b.md#sec', "
+            "but the doc 'b.md' does not contain an anchor '#sec'.",
+            messages,
+        )
+
+        # A page that was linked to (but didn't exist) appears, then disappears again.
+        Path(docs_dir, 'c.md').write_text('# C')
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, ['index.md', 'c.md'])
+        self.assertEqual(written, pages)
+        self.assertIn('href="c/"', Path(site_dir, 'index.html').read_text())
+        Path(docs_dir, 'c.md').unlink()
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, ['index.md'])
+        self.assertIn(
+            "Doc file 'index.md' contains a link 'c.md', "
+            "but the target is not found among documentation files.",
+            messages,
+        )
+
+        # The warnings of a page are reported again even if it isn't rendered again.
+        rendered, written, messages = dirty_build()
+        self.assertEqual(rendered, [])
+        self.assertEqual(written, [])
+        self.assertIn(
+            "Doc file 'index.md' contains a link 'c.md', "
+            "but the target is not found among documentation files.",
+            messages,
+        )
+
+    def test_config_digest(self):
+        digest = build._config_digest(load_config(copyright='a'))
+        # Values are compared rather than objects, so that a new process can use the digest.
+        self.assertEqual(build._config_digest(load_config(copyright='a')), digest)
+        self.assertNotEqual(build._config_digest(load_config(copyright='b')), digest)
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir()
+    def test_build_clean_no_build_state(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        with mock.patch.object(build._BuildState, '_last', None):
+            with self.assertLogs('mkdocs'):
+                build.build(cfg, dirty=True)
+            self.assertIsNotNone(build._BuildState._last)
+            # A clean build doesn't record anything, and forgets the previous record.
+            with mock.patch.object(build._BuildState, 'record_page') as record_page:
+                with self.assertLogs('mkdocs'):
+                    build.build(cfg)
+            record_page.assert_not_called()
+            self.assertIsNone(build._BuildState._last)
+            # Nor does a build for `mkdocs serve` without `--dirty`.
+            with mock.patch.object(build._BuildState, 'record_page') as record_page:
+                with self.assertLogs('mkdocs'):
+                    build.build(cfg, serve_url='http://localhost:8000/')
+            record_page.assert_not_called()
+            self.assertIsNone(build._BuildState._last)
+        # Nor is the template context factory kept, with the nav, files and config of the build.
+        self.assertIsNone(build._ContextFactory._last)
+
+    @tempdir(files={'index.md': 'page content', 'other.md': 'other page'})
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_build_dirty_skips_unchanged_files(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        build.build(cfg)
+        for path in Path(site_dir).rglob('*.html'):
+            os.utime(path, ns=(0, 0))
+
+        Path(docs_dir, 'other.md').write_text('changed page')
+        # Without the record of the previous build, all pages are considered modified.
+        with mock.patch.object(build._BuildState, '_last', None), self.assertLogs('mkdocs') as cm:
+            build.build(cfg, dirty=True)
+        self.assertIn(
+            'INFO:mkdocs.commands.build:1 of 4 pages and templates were changed in the site directory.',
+            cm.output,
+        )
+        changed = [
+            path.relative_to(site_dir).as_posix()
+            for path in Path(site_dir).rglob('*.html')
+            if path.stat().st_mtime_ns != 0
+        ]
+        self.assertEqual(changed, ['other/index.html'])
+
+    def _join_cleanup_threads(self):
+        build.wait_for_cleanup()
+
+    def _staging_dirs(self, site_dir):
+        parent, name = os.path.split(site_dir)
+        return [entry for entry in os.listdir(parent) if entry.startswith(f'.{name}.')]
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir(files={'stale.html': 'old', '.git/HEAD': 'ref'})
+    def test_build_atomic(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        seen_site_dirs = []
+        cfg.plugins.events['post_build'].append(
+            lambda config: seen_site_dirs.append(config.site_dir)
+        )
+        with self.assertLogs('mkdocs'):
+            build.build(cfg, atomic=True)
+        self._join_cleanup_threads()
+
+        self.assertEqual(len(seen_site_dirs), 1)
+        self.assertNotEqual(seen_site_dirs[0], site_dir)
+        self.assertEqual(cfg.site_dir, site_dir)
+        self.assertPathIsFile(site_dir, 'index.html')
+        self.assertPathNotExists(site_dir, 'stale.html')
+        self.assertPathIsFile(site_dir, '.git', 'HEAD')
+        self.assertEqual(self._staging_dirs(site_dir), [])
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir(files={'index.html': 'old'})
+    def test_build_atomic_error(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+
+        def on_post_build(config):
+            raise PluginError('Error message.')
+
+        cfg.plugins.events['post_build'].append(on_post_build)
+        with self.assertLogs('mkdocs'), self.assertRaises(Abort):
+            build.build(cfg, atomic=True)
+
+        self.assertEqual(Path(site_dir, 'index.html').read_text(), 'old')
+        self.assertEqual(self._staging_dirs(site_dir), [])
+        self.assertEqual(cfg.site_dir, site_dir)
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir(files={'v1/index.html': 'old', 'v1/.nojekyll': ''})
+    def test_build_atomic_symlink(self, parent_dir, docs_dir):
+        site_dir = os.path.join(parent_dir, 'site')
+        os.symlink('v1', site_dir)
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        for _ in range(2):
+            with self.assertLogs('mkdocs'):
+                build.build(cfg, atomic=True)
+            self._join_cleanup_threads()
+
+            self.assertTrue(os.path.islink(site_dir))
+            self.assertPathIsFile(site_dir, 'index.html')
+            self.assertEqual(self._staging_dirs(site_dir), [os.readlink(site_dir)])
+        # A directory that wasn't created by MkDocs is left alone.
+        self.assertEqual(Path(parent_dir, 'v1', 'index.html').read_text(), 'old')
+        self.assertPathIsFile(parent_dir, 'v1', '.nojekyll')
+        self.assertPathNotExists(site_dir, '.nojekyll')
+
+    @tempdir(files={'index.md': 'page content'})
+    @tempdir(files={'site/stale.html': 'old', 'site/.git/HEAD': 'ref', '.site.1234.old/a': ''})
+    def test_build_atomic_without_exchange(self, parent_dir, docs_dir):
+        site_dir = os.path.join(parent_dir, 'site')
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        with mock.patch.object(build, '_exchange_paths', return_value=False) as exchange:
+            with self.assertLogs('mkdocs'):
+                build.build(cfg, atomic=True)
+        self._join_cleanup_threads()
+        exchange.assert_called_once()
+
+        self.assertPathIsFile(site_dir, 'index.html')
+        self.assertPathNotExists(site_dir, 'stale.html')
+        self.assertPathIsFile(site_dir, '.git', 'HEAD')
+        # Including an old tree whose deletion was interrupted.
+        self.assertEqual(self._staging_dirs(site_dir), [])
+
+    @tempdir(files={'index.md': 'page content', 'other.md': 'other content'})
+    @tempdir()
+    def test_build_profiler(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        profiler = Profiler()
+        with self.assertLogs('mkdocs'):
+            build.build(cfg, profiler=profiler)
+        self.assertEqual(
+            [span.name for span in profiler.phases],
+            [
+                'config',
+                'files',
+                'nav',
+                'read pages',
+                'env',
+                'static files',
+                'templates',
+                'build pages',
+                'validate anchors',
+                'post_build',
+            ],
+        )
+        self.assertEqual(
+            [(span.name, span.category) for span in profiler.steps],
+            [
+                ('index.md', 'markdown'),
+                ('other.md', 'markdown'),
+                ('index.md', 'template'),
+                ('other.md', 'template'),
+            ],
+        )
+
+    def test_build_atomic_dirty(self):
+        cfg = load_config()
+        with self.assertRaises(ValueError):
+            build.build(cfg, atomic=True, dirty=True)
+
+    @tempdir(
+        files={
+            'index.md': '# Welcome\n\n[foo](foo.md#bar)',
+            'foo.md': '# Foo\n\n## Baz\n\n[nonexistent](nonexistent.md)',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_build_with_cache_dir(self, cache_dir, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, cache_dir=cache_dir)
+        expected_logs = """
+            WARNING:Doc file 'foo.md' contains a link 'nonexistent.md', but the target is not found among documentation files.
+            INFO:Doc file 'index.md' contains a link 'foo.md#bar', but the doc 'foo.md' does not contain an anchor '#bar'.
+        """
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg)
+        output = Path(site_dir, 'foo', 'index.html').read_text()
+        self.assertEqual(len(list(Path(cache_dir, 'pages').glob('*/*.json'))), 2)
+
+        # The pages are not converted again, but the warnings are still reported.
+        with mock.patch('markdown.Markdown.convert', side_effect=AssertionError) as convert:
+            with self._assert_build_logs(expected_logs):
+                build.build(cfg)
+        convert.assert_not_called()
+        self.assertEqual(Path(site_dir, 'foo', 'index.html').read_text(), output)
+
+        # A change to the source or to the set of files invalidates the cache.
+        Path(docs_dir, 'foo.md').write_text('# Foo\n\n## Bar')
+        Path(docs_dir, 'nonexistent.md').write_text('Now exists')
+        with self._assert_build_logs(''):
+            build.build(cfg)
+        self.assertEqual(len(list(Path(cache_dir, 'pages').glob('*/*.json'))), 5)
+
     @tempdir(
         files={
             'README.md': 'CONFIG_README\n',
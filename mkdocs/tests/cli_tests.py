@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import io
+import json
 import logging
 import unittest
 from unittest import mock
@@ -257,6 +258,81 @@ class CLITests(unittest.TestCase):
         self.assertTrue('dirty' in kwargs)
         self.assertTrue(kwargs['dirty'])
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_jobs(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--jobs', '4'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertEqual(kwargs['jobs'], 4)
+        mock_load_config.assert_called_once_with(
+            config_file=None,
+            strict=None,
+            theme=None,
+            use_directory_urls=None,
+            site_dir=None,
+        )
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_atomic(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--atomic'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['atomic'])
+        self.assertFalse(kwargs['dirty'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_atomic_dirty(self, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--atomic', '--dirty'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--atomic can't be combined with --dirty.", result.output)
+        mock_build.assert_not_called()
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_profile(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build'], catch_exceptions=False)
+        self.assertIsNone(mock_build.call_args[1]['profiler'])
+
+        with self.runner.isolated_filesystem():
+            with self.assertLogs('mkdocs.commands.build', level='INFO') as cm:
+                result = self.runner.invoke(
+                    cli.cli, ['build', '--profile-file', 'trace.json'], catch_exceptions=False
+                )
+            self.assertEqual(result.exit_code, 0)
+            messages = [record.getMessage() for record in cm.records]
+            self.assertTrue(messages[0].startswith('Build profile:\n'))
+            self.assertEqual(messages[1], 'Build profile written to: trace.json')
+            self.assertIsNotNone(mock_build.call_args[1]['profiler'])
+            with open('trace.json') as f:
+                self.assertEqual(json.load(f)['traceEvents'], [])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_plugin_stats(self, mock_build, mock_load_config):
+        cfg = mock_load_config.return_value
+        cfg.plugins.format_stats.return_value = 'stats'
+        with self.assertLogs('mkdocs.commands.build', level='INFO') as cm:
+            result = self.runner.invoke(
+                cli.cli, ['build', '--plugin-stats'], catch_exceptions=False
+            )
+        self.assertEqual(result.exit_code, 0)
+        cfg.plugins.enable_stats.assert_called_once_with()
+        cfg.plugins.format_stats.assert_called_once_with()
+        self.assertEqual(
+            [record.getMessage() for record in cm.records],
+            ['Time spent in plugin events:\nstats'],
+        )
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_config_file(self, mock_build, mock_load_config):
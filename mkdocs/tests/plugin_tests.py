@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 import unittest
 from typing import TYPE_CHECKING, Optional
+from unittest import mock
 
 if TYPE_CHECKING:
     from typing_extensions import assert_type
@@ -124,9 +125,11 @@ class TestPluginCollection(unittest.TestCase):
                 'template_context': [],
                 'post_template': [],
                 'pre_page': [],
+                'pre_page_batch': [],
                 'page_read_source': [plugin.on_page_read_source],
                 'page_markdown': [],
                 'page_content': [plugin.on_page_content],
+                'page_content_batch': [],
                 'page_context': [],
                 'post_page': [],
             },
@@ -251,6 +254,50 @@ class TestPluginCollection(unittest.TestCase):
         collection['foo'] = plugin
         self.assertEqual(collection.on_pre_build(config={}), None)
 
+    def test_event_without_handlers(self):
+        collection = plugins.PluginCollection()
+        with mock.patch.object(collection, 'run_event') as mock_run_event:
+            self.assertEqual(
+                collection.on_page_content('html', page=None, config={}, files=[]), 'html'
+            )
+            self.assertIsNone(collection.on_page_read_source(page=None, config={}))
+        mock_run_event.assert_not_called()
+
+    def test_run_event_after_modifying_events(self):
+        collection = plugins.PluginCollection()
+        self.assertEqual(collection.run_event('page_content', 'html'), 'html')
+        collection.events['page_content'].append(lambda html: html + ' 1')
+        self.assertEqual(collection.run_event('page_content', 'html'), 'html 1')
+        collection.events['page_content'][0] = lambda html: html + ' 2'
+        self.assertEqual(collection.run_event('page_content', 'html'), 'html 2')
+        collection.events['page_content'] = []
+        self.assertEqual(collection.run_event('page_content', 'html'), 'html')
+
+    def test_run_event_stats(self):
+        collection = plugins.PluginCollection()
+        plugin = DummyPlugin()
+        plugin.load_config({'foo': 'new'})
+        collection['foo'] = plugin
+        collection.on_nav(['nav item'], config={}, files=[])
+        self.assertIsNone(collection.stats)
+
+        collection.enable_stats()
+        for _ in range(2):
+            collection.on_nav(['nav item'], config={}, files=[])
+        collection.on_pre_build(config={})
+        assert collection.stats is not None
+        self.assertEqual(set(collection.stats), {('foo', 'nav'), ('foo', 'pre_build')})
+        self.assertEqual(collection.stats[('foo', 'nav')].calls, 2)
+
+        collection.add_stats({('foo', 'nav'): plugins.EventStats(calls=3, seconds=1.0)})
+        self.assertEqual(collection.stats[('foo', 'nav')].calls, 5)
+        self.assertGreaterEqual(collection.stats[('foo', 'nav')].seconds, 1.0)
+
+        lines = collection.format_stats().splitlines()
+        self.assertEqual(lines[0].split(), ['Plugin', 'Event', 'Calls', 'Seconds'])
+        self.assertEqual(lines[1].split()[:3], ['foo', 'nav', '5'])
+        self.assertEqual(lines[2].split()[:3], ['foo', 'pre_build', '1'])
+
     def test_run_undefined_event_on_collection(self):
         collection = plugins.PluginCollection()
         self.assertEqual(
@@ -1,16 +1,18 @@
 #!/usr/bin/env python
 
+import gzip
 import json
+import os
 import unittest
 from unittest import mock
 
 from mkdocs.config.config_options import ValidationError
 from mkdocs.contrib import search
-from mkdocs.contrib.search import search_index
+from mkdocs.contrib.search import lunr_index, search_index
 from mkdocs.structure.files import File
 from mkdocs.structure.pages import Page
 from mkdocs.structure.toc import get_toc
-from mkdocs.tests.base import dedent, get_markdown_toc, load_config
+from mkdocs.tests.base import dedent, get_markdown_toc, load_config, tempdir
 
 
 def strip_whitespace(string):
@@ -81,6 +83,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-]+',
             'min_search_length': 3,
             'prebuild_index': False,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'full',
         }
         plugin = search.SearchPlugin()
@@ -95,6 +100,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-]+',
             'min_search_length': 3,
             'prebuild_index': False,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'full',
         }
         plugin = search.SearchPlugin()
@@ -109,6 +117,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-\.]+',
             'min_search_length': 3,
             'prebuild_index': False,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'full',
         }
         plugin = search.SearchPlugin()
@@ -123,6 +134,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-]+',
             'min_search_length': 2,
             'prebuild_index': False,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'full',
         }
         plugin = search.SearchPlugin()
@@ -137,6 +151,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-]+',
             'min_search_length': 3,
             'prebuild_index': True,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'full',
         }
         plugin = search.SearchPlugin()
@@ -151,6 +168,9 @@ class SearchPluginTests(unittest.TestCase):
             'separator': r'[\s\-]+',
             'min_search_length': 3,
             'prebuild_index': False,
+            'sharded_index': False,
+            'index_format': 'json',
+            'compress': [],
             'indexing': 'titles',
         }
         plugin = search.SearchPlugin()
@@ -234,6 +254,85 @@ class SearchPluginTests(unittest.TestCase):
         self.assertEqual(mock_copy_file.call_count, 0)
         self.assertEqual(mock_write_file.call_count, 1)
 
+    @mock.patch('mkdocs.utils.write_file', autospec=True)
+    @mock.patch('mkdocs.utils.copy_file', autospec=True)
+    def test_event_on_post_build_sharded_index(self, mock_copy_file, mock_write_file):
+        plugin = search.SearchPlugin()
+        plugin.load_config({'prebuild_index': True, 'sharded_index': True})
+        config = load_config(theme='mkdocs')
+        plugin.on_config(config)
+        plugin.on_pre_build(config)
+        plugin.search_index._add_entry(title='Home', text='Welcome', loc='')
+        plugin.on_post_build(config)
+        self.assertEqual(
+            [os.path.relpath(call.args[1], config.site_dir) for call in mock_write_file.mock_calls],
+            [
+                os.path.join('search', 'shards', 'terms-68.json'),
+                os.path.join('search', 'shards', 'terms-77.json'),
+                os.path.join('search', 'shards', 'text-0.json'),
+                os.path.join('search', 'search_index.json'),
+            ],
+        )
+
+    @tempdir()
+    def test_event_on_post_build_compress(self, site_dir):
+        plugin = search.SearchPlugin()
+        plugin.load_config({'index_format': 'compact', 'compress': ['gzip']})
+        config = load_config(theme='mkdocs', site_dir=site_dir)
+        plugin.on_config(config)
+        plugin.on_pre_build(config)
+        plugin.search_index._add_entry(title='Home', text='Welcome', loc='')
+        plugin.on_post_build(config)
+        path = os.path.join(site_dir, 'search', 'search_index.json')
+        with open(path, 'rb') as f, gzip.open(path + '.gz') as g:
+            self.assertEqual(g.read(), f.read())
+        with open(path, 'rb') as f:
+            self.assertIn('compact', json.load(f))
+
+        # The index didn't change, so it isn't compressed again.
+        with mock.patch.object(search, '_write_compressed', autospec=True) as mock_compress:
+            plugin.on_post_build(config)
+        mock_compress.assert_not_called()
+
+        # The copies for methods that were removed from `compress` are removed too.
+        plugin.load_config({'index_format': 'compact', 'compress': []})
+        plugin.on_config(config)
+        plugin.on_pre_build(config)
+        plugin.search_index._add_entry(title='Home', text='Welcome', loc='')
+        plugin.on_post_build(config)
+        self.assertTrue(os.path.isfile(path))
+        self.assertFalse(os.path.exists(path + '.gz'))
+
+    @tempdir()
+    def test_event_on_post_build_sharded_index_stale_shards(self, site_dir):
+        plugin = search.SearchPlugin()
+        plugin.load_config({'prebuild_index': True, 'sharded_index': True, 'compress': ['gzip']})
+        config = load_config(theme='mkdocs', site_dir=site_dir)
+        plugin.on_config(config)
+        plugin.on_pre_build(config)
+        plugin.search_index._add_entry(title='Home', text='Welcome', loc='')
+        plugin.on_post_build(config)
+        shards_dir = os.path.join(site_dir, 'search', 'shards')
+        self.assertEqual(
+            sorted(os.listdir(shards_dir)),
+            [
+                'terms-68.json',
+                'terms-68.json.gz',
+                'terms-77.json',
+                'terms-77.json.gz',
+                'text-0.json',
+                'text-0.json.gz',
+            ],
+        )
+
+        plugin.on_pre_build(config)
+        plugin.search_index._add_entry(title='Home', text='Hello', loc='')
+        plugin.on_post_build(config)
+        self.assertEqual(
+            sorted(os.listdir(shards_dir)),
+            ['terms-68.json', 'terms-68.json.gz', 'text-0.json', 'text-0.json.gz'],
+        )
+
     @mock.patch('mkdocs.utils.write_file', autospec=True)
     @mock.patch('mkdocs.utils.copy_file', autospec=True)
     def test_event_on_post_build_single_lang(self, mock_copy_file, mock_write_file):
@@ -313,6 +412,39 @@ class SearchIndexTests(unittest.TestCase):
 
         self.assertEqual(parser.data, [])
 
+    def test_content_parser_from_html(self):
+        for html in (
+            '<p>Before</p><H2 class=x ID="a&amp;b">Title &lt;1&gt;</h2><!-- c --><p>Text<br/>more</p>',
+            '<h2 id="a">Title</h2><p>Text with a < sign</p>',
+            '<h2 id="a">Title</h2><script>if (a<b) {}</script><p>Text</p>',
+            '<h2 id="a"/>Text<h3>Title</h3>',
+        ):
+            with self.subTest(html):
+                parser = search_index.ContentParser()
+                parser.feed(html)
+                parser.close()
+                result = search_index.ContentParser.from_html(html)
+                self.assertEqual(result.data, parser.data)
+                self.assertEqual(result.stripped_html, parser.stripped_html)
+
+    def test_toc_items_by_id(self):
+        md = dedent(
+            """
+            # Heading 1
+            ## Heading 2
+            ### Heading 3
+            # Other
+            ## Other 2
+            """
+        )
+        toc = get_toc(get_markdown_toc(md))
+        # Same as `_find_toc_by_id` for duplicate IDs.
+        toc.items[1].children[0].id = 'heading-3'
+        toc_items = search_index._toc_items_by_id(toc)
+        self.assertEqual(list(toc_items), ['heading-1', 'heading-2', 'heading-3', 'other'])
+        for id_, toc_item in toc_items.items():
+            self.assertIs(toc_item, search_index.SearchIndex()._find_toc_by_id(toc, id_))
+
     def test_find_toc_by_id(self):
         """Test finding the relevant TOC item by the tag ID."""
         index = search_index.SearchIndex()
@@ -631,3 +763,210 @@ class SearchIndexTests(unittest.TestCase):
         self.assertEqual(mock_popen.call_count, 1)
         self.assertEqual(mock_popen_obj.communicate.call_count, 1)
         self.assertEqual(result, expected)
+
+    @mock.patch('subprocess.Popen', autospec=True)
+    def test_prebuild_index_english(self, mock_popen):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-]+')
+        index._add_entry(title='Home', text='Welcome to the running docs.', loc='')
+        index._add_entry(title='About', text='Runs and runners (ran).', loc='about/')
+        result = json.loads(index.generate_search_index())
+        self.assertEqual(mock_popen.call_count, 0)
+        # The same as the output of `prebuild-index.js` for these documents.
+        self.assertEqual(
+            result['index'],
+            {
+                'version': '2.3.9',
+                'fields': ['title', 'text'],
+                'fieldVectors': [
+                    ['title/', [0, 0.492]],
+                    ['text/', [1, 0.693, 2, 0.182, 3, 0.693]],
+                    ['title/about/', []],
+                    ['text/about/', [2, 0.182, 4, 0.693, 5, 0.693]],
+                ],
+                'invertedIndex': [
+                    ['doc', {'_index': 3, 'title': {}, 'text': {'': {}}}],
+                    ['home', {'_index': 0, 'title': {'': {}}, 'text': {}}],
+                    ['ran', {'_index': 5, 'title': {}, 'text': {'about/': {}}}],
+                    ['run', {'_index': 2, 'title': {}, 'text': {'': {}, 'about/': {}}}],
+                    ['runner', {'_index': 4, 'title': {}, 'text': {'about/': {}}}],
+                    ['welcom', {'_index': 1, 'title': {}, 'text': {'': {}}}],
+                ],
+                'pipeline': ['stemmer'],
+            },
+        )
+
+    @mock.patch('subprocess.Popen', autospec=True)
+    def test_prebuild_index_english_separator(self, mock_popen):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-\.]+')
+        index._add_entry(title='Config', text='Set search.separator-option.', loc='')
+        result = json.loads(index.generate_search_index())
+        self.assertEqual(mock_popen.call_count, 0)
+        terms = [term for term, posting in result['index']['invertedIndex']]
+        self.assertEqual(terms, ['config', 'option', 'search', 'separ', 'set'])
+
+    @mock.patch('subprocess.Popen', autospec=True)
+    def test_prebuild_index_invalid_python_separator(self, mock_popen):
+        mock_popen.return_value = mock.Mock()
+        mock_popen_obj = mock_popen.return_value
+        mock_popen_obj.communicate.return_value = ('{"mock": "index"}', None)
+
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\p{P}]')
+        result = json.loads(index.generate_search_index())
+        self.assertEqual(mock_popen.call_count, 1)
+        self.assertEqual(result['index'], {'mock': 'index'})
+
+    @mock.patch('subprocess.Popen', autospec=True)
+    def test_prebuild_index_other_language(self, mock_popen):
+        mock_popen.return_value = mock.Mock()
+        mock_popen_obj = mock_popen.return_value
+        mock_popen_obj.communicate.return_value = ('{"mock": "index"}', None)
+
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en', 'fr'])
+        with self.assertLogs('mkdocs', level='INFO') as cm:
+            result = json.loads(index.generate_search_index())
+        self.assertEqual(len(cm.output), 1)
+        self.assertIn("with Node.js", cm.output[0])
+        self.assertTrue(cm.output[0].endswith("not for the search languages: fr"))
+        self.assertEqual(mock_popen.call_count, 1)
+        self.assertEqual(result['index'], {'mock': 'index'})
+
+    def test_generate_search_index_chunks(self):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-]+')
+        index._add_entry(title='Home', text='Welcome to the running docs.', loc='')
+        index._add_entry(title='Ünïcode', text='"Quoted" {text}', loc='#unicode')
+        expected = index.generate_search_index()
+        self.assertEqual(b''.join(index.generate_search_index_chunks()), expected.encode())
+        chunks = list(search_index._iter_json(json.loads(expected), chunk_size=10))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(''.join(chunks), expected)
+
+    def test_compact_index(self):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-]+')
+        index._add_entry(title='Home', text='Welcome to the running docs.', loc='')
+        index._add_entry(title='About', text='Runs and runners.', loc='about/')
+        index._add_entry(title='Running', text='', loc='about/#running')
+        index._add_entry(title='Home', text='Welcome', loc='#welcome')
+        result = json.loads(b''.join(index.generate_search_index_chunks(compact=True)))
+        self.assertEqual(
+            result,
+            {
+                'config': {'prebuild_index': True, 'lang': ['en'], 'separator': r'[\s\-]+'},
+                'compact': {
+                    'pages': ['', 'about/'],
+                    'page': [0, 1, 1, 0],
+                    'anchor': ['', '', '#running', '#welcome'],
+                    'titles': ['Home', 'About', 'Running'],
+                    'title': [0, 1, 2, 0],
+                    'text': ['Welcome to the running docs.', 'Runs and runners.', '', 'Welcome'],
+                    'index': {
+                        'version': '2.3.9',
+                        'fields': ['title', 'text'],
+                        'pipeline': ['stemmer'],
+                        'terms': ['home', 'welcom', 'run', 'doc', 'runner'],
+                        'postings': [
+                            [[0, 3], []],
+                            [[], [0, 3]],
+                            [[2], [0, 1]],
+                            [[], [0]],
+                            [[], [1]],
+                        ],
+                        'vectors': [
+                            [[0, 0.61], [], [2, 0.314], [0, 0.61]],
+                            [[1, 0.492, 1, 0.253, 1, 0.854], [2, 0.314, 2, 1.059], [], [1, 0.803]],
+                        ],
+                    },
+                },
+            },
+        )
+
+    def test_compact_index_duplicate_locations(self):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-]+')
+        index._add_entry(title='Home', text='Welcome', loc='')
+        index._add_entry(title=None, text='Running', loc='')
+        full = json.loads(index.generate_search_index())
+        compact = json.loads(b''.join(index.generate_search_index_chunks(compact=True)))
+        self.assertEqual(compact['compact']['titles'], ['Home', None])
+        # Both documents have the same ref, which is the first document with the location,
+        # and as in Lunr.js, its vectors are those of the last document.
+        self.assertEqual(compact['compact']['index']['postings'], [[[0], []], [[], [0]], [[], [0]]])
+        self.assertEqual(compact['compact']['index']['vectors'], [[[], []], [[2, 0.693], []]])
+        self.assertEqual(len(full['index']['fieldVectors']), 2)
+
+    def test_sharded_index(self):
+        index = search_index.SearchIndex(prebuild_index=True, lang=['en'], separator=r'[\s\-]+')
+        index._add_entry(title='Home', text='Welcome to the running docs.', loc='')
+        index._add_entry(title='About', text='Runs and runners (ran).', loc='about/')
+        index._add_entry(title='Ünïcode', text='', loc='about/#unicode')
+        files = {k: json.loads(v) for k, v in index.generate_sharded_search_index().items()}
+        self.assertEqual(
+            files['search_index.json'],
+            {
+                'docs': [
+                    {'location': '', 'title': 'Home'},
+                    {'location': 'about/', 'title': 'About'},
+                    {'location': 'about/#unicode', 'title': 'Ünïcode'},
+                ],
+                'config': {'prebuild_index': True, 'lang': ['en'], 'separator': r'[\s\-]+'},
+                'shards': {
+                    'version': '2.3.9',
+                    'fields': ['title', 'text'],
+                    'pipeline': ['stemmer'],
+                    'terms': {
+                        '64': 'shards/terms-64.json',
+                        '68': 'shards/terms-68.json',
+                        '6e': 'shards/terms-6e.json',
+                        '72': 'shards/terms-72.json',
+                        '77': 'shards/terms-77.json',
+                    },
+                    'text': [{'file': 'shards/text-0.json', 'docs': 3}],
+                },
+            },
+        )
+        self.assertEqual(
+            files['shards/text-0.json'],
+            ['Welcome to the running docs.', 'Runs and runners (ran).', ''],
+        )
+        self.assertEqual(
+            files['shards/terms-72.json'],
+            {
+                'invertedIndex': [
+                    ['ran', {'_index': 5, 'title': {}, 'text': {'about/': {}}}],
+                    ['run', {'_index': 2, 'title': {}, 'text': {'': {}, 'about/': {}}}],
+                    ['runner', {'_index': 4, 'title': {}, 'text': {'about/': {}}}],
+                ],
+                'fieldVectors': [
+                    ['text/', [2, 0.39]],
+                    ['text/about/', [2, 0.39, 4, 0.814, 5, 0.814]],
+                ],
+            },
+        )
+        self.assertEqual(search_index._term_shard('ünïcode'), '0xx')
+        self.assertEqual(search_index._term_shard('中文'), '4exx')
+        self.assertEqual(search_index._term_shard('😀'), 'd8xx')
+
+    @mock.patch('subprocess.Popen', autospec=True)
+    def test_sharded_index_not_prebuilt(self, mock_popen):
+        index = search_index.SearchIndex(prebuild_index=False)
+        with self.assertLogs('mkdocs', level='WARNING'):
+            files = index.generate_sharded_search_index()
+        self.assertEqual(list(files), ['search_index.json'])
+        self.assertEqual(files['search_index.json'], index.generate_search_index())
+
+    def test_lunr_stemmer(self):
+        stem = lunr_index._PorterStemmer()
+        for word, expected in [
+            ('caresses', 'caress'),
+            ('ponies', 'poni'),
+            ('agreed', 'agre'),
+            ('hopping', 'hop'),
+            ('sized', 'size'),
+            ('happy', 'happi'),
+            ('relational', 'relat'),
+            ('electrical', 'electr'),
+            ('adjustment', 'adjust'),
+            ('controll', 'control'),
+            ('yelling', 'yell'),
+            ('at', 'at'),
+        ]:
+            with self.subTest(word):
+                self.assertEqual(stem(word), expected)
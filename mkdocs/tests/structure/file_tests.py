@@ -3,7 +3,15 @@ import sys
 import unittest
 from unittest import mock
 
-from mkdocs.structure.files import File, Files, _sort_files, file_sort_key, get_files
+from mkdocs.structure.files import (
+    File,
+    Files,
+    InclusionLevel,
+    _InclusionMatcher,
+    _sort_files,
+    file_sort_key,
+    get_files,
+)
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
 
 
@@ -340,6 +348,12 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(files.get_file_from_path('foo/bar.jpg'), fs[3])
         self.assertEqual(files.get_file_from_path('foo/bar.jpg'), fs[3])
         self.assertEqual(files.get_file_from_path('missing.jpg'), None)
+        self.assertEqual(files.get_file_from_path('./foo//bar.jpg'), fs[3])
+        self.assertEqual(files.get_file_from_path('foo/./bar.jpg'), fs[3])
+        self.assertEqual(
+            files.get_files_from_paths(['foo/bar.jpg', './index.md', 'missing.jpg']),
+            [fs[3], fs[0], None],
+        )
         self.assertTrue(fs[2].src_uri in files.src_uris)
         extra_file = File('extra.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
         self.assertFalse(extra_file.src_uri in files.src_uris)
@@ -602,6 +616,45 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
             ['.dotfile', 'templates/foo.html'],
         )
 
+    @tempdir(
+        files=[
+            'index.md',
+            'drafts/a.md',
+            'drafts/b/b.md',
+            'foo/a.md',
+            'foo/b.md',
+            '.hidden/c.md',
+            'templates/d.html',
+        ]
+    )
+    def test_get_files_excluded_dirs(self, tdir):
+        config = load_config(docs_dir=tdir, exclude_docs='drafts/\nfoo/b.md\n')
+        with mock.patch.object(_InclusionMatcher, '_last', None), mock.patch.object(
+            _InclusionMatcher, 'get_level', autospec=True, side_effect=_InclusionMatcher.get_level
+        ) as mock_get_level:
+            files = get_files(config)
+        # The files in excluded directories are still known, as excluded.
+        self.assertEqual(
+            [f.src_uri for f in files if f.inclusion.is_excluded()],
+            ['.hidden/c.md', 'drafts/a.md', 'drafts/b/b.md', 'foo/b.md', 'templates/d.html'],
+        )
+        self.assertEqual(
+            [f.src_uri for f in files if f.inclusion.is_included()], ['index.md', 'foo/a.md']
+        )
+        # But they aren't matched one by one.
+        self.assertEqual(
+            sorted(call.args[1] for call in mock_get_level.call_args_list),
+            ['foo/a.md', 'foo/b.md', 'index.md'],
+        )
+
+        # With a negated pattern, the files in excluded directories have to be matched one by one.
+        config = load_config(docs_dir=tdir, exclude_docs='drafts/\n!drafts/b/b.md\n')
+        files = get_files(config)
+        self.assertEqual(
+            [f.src_uri for f in files if f.inclusion.is_included()],
+            ['index.md', 'drafts/b/b.md', 'foo/a.md', 'foo/b.md'],
+        )
+
     @tempdir(
         files=[
             'README.md',
@@ -633,6 +686,42 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertIsInstance(files, Files)
         self.assertEqual([f.src_uri for f in files], ['index.md', 'foo.md'])
 
+    @tempdir(files=['index.md', 'a/a.md', 'a/b/b.md', 'c/c.md'])
+    def test_get_files_reuses_listings(self, tdir):
+        def set_old_mtimes(mtime):
+            for path, _, _ in os.walk(tdir):
+                os.utime(path, ns=(mtime, mtime))
+
+        config = load_config(docs_dir=tdir)
+        set_old_mtimes(0)
+        files = get_files(config)
+        expected = ['index.md', 'a/a.md', 'a/b/b.md', 'c/c.md']
+        self.assertEqual([f.src_uri for f in files], expected)
+
+        with mock.patch('os.scandir', wraps=os.scandir) as mock_scandir:
+            files = get_files(config)
+        self.assertEqual([f.src_uri for f in files], expected)
+        mock_scandir.assert_not_called()
+
+        # A directory that was modified recently is always listed again.
+        with open(os.path.join(tdir, 'a', 'b', 'new.md'), 'w'):
+            pass
+        for _ in range(2):
+            with mock.patch('os.scandir', wraps=os.scandir) as mock_scandir:
+                files = get_files(config)
+            self.assertEqual(
+                [f.src_uri for f in files],
+                ['index.md', 'a/a.md', 'a/b/b.md', 'a/b/new.md', 'c/c.md'],
+            )
+            mock_scandir.assert_called_once_with(os.path.join(tdir, 'a', 'b'))
+
+        os.remove(os.path.join(tdir, 'c', 'c.md'))
+        set_old_mtimes(10**9)
+        files = get_files(config)
+        self.assertEqual(
+            [f.src_uri for f in files], ['index.md', 'a/a.md', 'a/b/b.md', 'a/b/new.md']
+        )
+
     @tempdir()
     @tempdir(files={'test.txt': 'source content'})
     def test_copy_file(self, src_dir, dest_dir):
@@ -686,6 +775,19 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         with open(dest_path, encoding='utf-8') as f:
             self.assertEqual(f.read(), 'destination content')
 
+    @tempdir(files={'test.txt': 'destination'})
+    @tempdir(files={'test.txt': 'source text'})
+    def test_copy_file_same_size_and_mtime(self, src_dir, dest_dir):
+        file = File('test.txt', src_dir, dest_dir, use_directory_urls=False)
+        dest_path = os.path.join(dest_dir, 'test.txt')
+        for strategy, expected in ('reflink', 'destination'), ('copy', 'source text'):
+            with self.subTest(strategy):
+                os.utime(file.abs_src_path, ns=(0, 10**9))
+                os.utime(dest_path, ns=(0, 10**9))
+                file.copy_file(strategy=strategy)
+                with open(dest_path, encoding='utf-8') as f:
+                    self.assertEqual(f.read(), expected)
+
     @tempdir()
     def test_copy_file_from_content(self, dest_dir):
         file = File('test.txt', src_dir='unused', dest_dir=dest_dir, use_directory_urls=False)
@@ -708,6 +810,30 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         with open(dest_path, encoding='utf-8') as f:
             self.assertEqual(f.read(), 'ö')
 
+    @tempdir()
+    @tempdir(files={'index.md': '', 'a.css': 'a', 'img/b.png': 'b', 'img/c/d.png': 'd'})
+    def test_copy_static_files(self, src_dir, dest_dir):
+        uris = ['index.md', 'a.css', 'img/b.png', 'img/c/d.png']
+        for jobs in 1, 4:
+            with self.subTest(jobs=jobs):
+                site_dir = os.path.join(dest_dir, str(jobs))
+                files = Files(
+                    [File(uri, src_dir, site_dir, use_directory_urls=True) for uri in uris]
+                )
+                files.copy_static_files(jobs=jobs)
+                self.assertPathNotExists(site_dir, 'index.md')
+                for uri in uris[1:]:
+                    self.assertPathIsFile(site_dir, uri)
+
+    @tempdir()
+    @tempdir(files={'a.css': 'a', 'c.css': 'c'})
+    def test_copy_static_files_error(self, src_dir, dest_dir):
+        uris = ['a.css', 'b.css', 'c.css']
+        files = Files([File(uri, src_dir, dest_dir, use_directory_urls=True) for uri in uris])
+        with self.assertRaises(FileNotFoundError) as cm:
+            files.copy_static_files(jobs=4)
+        self.assertEqual(cm.exception.filename, os.path.join(src_dir, 'b.css'))
+
     def test_files_append_remove_src_paths(self):
         fs = [
             File('index.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
@@ -744,3 +870,26 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(len(files), 2)
         self.assertEqual(list(files)[0].src_uri, 'b.jpg')
         self.assertEqual(list(files)[1].src_uri, 'a.md')
+
+    def test_files_categories_after_changes(self):
+        fs = [
+            File('a.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('b.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('c.css', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+        ]
+        files = Files(fs)
+        self.assertEqual(files.documentation_pages(), [fs[0], fs[1]])
+        self.assertEqual(files.css_files(), [fs[2]])
+
+        # The index is updated by `append` and `remove`, and keeps the order of the files.
+        with self.assertWarns(DeprecationWarning):
+            files.append(fs[0])
+        files.remove(fs[2])
+        self.assertEqual(files.documentation_pages(), [fs[1], fs[0]])
+        self.assertEqual(files.css_files(), [])
+        self.assertEqual(files.media_files(), [])
+
+        # The inclusion of a file isn't indexed.
+        fs[1].inclusion = InclusionLevel.EXCLUDED
+        self.assertEqual(files.documentation_pages(), [fs[0]])
+        self.assertEqual(files.documentation_pages(inclusion=lambda i: True), [fs[1], fs[0]])
@@ -9,7 +9,8 @@ from unittest import mock
 import markdown
 
 from mkdocs.config.defaults import MkDocsConfig
-from mkdocs.structure.files import File, Files
+from mkdocs.structure import pages
+from mkdocs.structure.files import File, Files, InclusionLevel
 from mkdocs.structure.pages import Page, _ExtractTitleTreeprocessor, _RelativePathTreeprocessor
 from mkdocs.tests.base import dedent, tempdir
 
@@ -739,6 +740,69 @@ class PageTests(unittest.TestCase):
             ),
         )
 
+    @mock.patch.object(pages, '_RESET_CLEARS_EXTENSIONS', True)
+    def test_page_render_reuses_markdown(self):
+        cfg = load_config(markdown_extensions=['toc', 'footnotes'])
+        fl_a = File('a.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        fl_b = File('b.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        files = Files([fl_a, fl_b])
+        pg_a = Page(None, fl_a, cfg)
+        pg_a.markdown = '# A\n\n## Sub\n\nText[^1] [b](b.md#x)\n\n[^1]: Note'
+        pg_b = Page(None, fl_b, cfg)
+        pg_b.markdown = 'No title [a](a.md)'
+
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md_cls:
+            pg_a.render(cfg, files)
+            pg_b.render(cfg, files)
+        md_cls.assert_called_once()
+
+        # Nothing from the first page leaks into the second one.
+        self.assertEqual(pg_b.content, '<p>No title <a href="../a/">a</a></p>')
+        self.assertEqual(pg_b.title, 'B')
+        self.assertEqual(list(pg_b.toc), [])
+        self.assertEqual(pg_b.present_anchor_ids, set())
+        self.assertEqual(pg_b.links_to_anchors, {})
+        self.assertEqual(
+            pg_a.links_to_anchors,
+            {fl_a: {'fn:1': '#fn:1', 'fnref:1': '#fnref:1'}, fl_b: {'x': 'b.md#x'}},
+        )
+        self.assertEqual(pg_a.title, 'A')
+        self.assertEqual(pg_a.present_anchor_ids, {'a', 'sub', 'fn:1', 'fnref:1'})
+
+        # A different config gets its own instance.
+        cfg = load_config(markdown_extensions=['toc'])
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md_cls:
+            pg_a.render(cfg, files)
+        md_cls.assert_called_once()
+        self.assertNotIn('footnote', pg_a.content)
+
+    def test_page_render_abbreviations(self):
+        cfg = load_config(markdown_extensions=['abbr'])
+        fl_a = File('a.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        fl_b = File('b.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        files = Files([fl_a, fl_b])
+        pg_a = Page(None, fl_a, cfg)
+        pg_a.markdown = 'HTML\n\n*[HTML]: Hyper Text'
+        pg_b = Page(None, fl_b, cfg)
+        pg_b.markdown = 'HTML'
+
+        pg_a.render(cfg, files)
+        pg_b.render(cfg, files)
+        self.assertEqual(pg_a.content, '<p><abbr title="Hyper Text">HTML</abbr></p>')
+        self.assertEqual(pg_b.content, '<p>HTML</p>')
+
+    @mock.patch.object(pages, '_RESET_CLEARS_EXTENSIONS', False)
+    def test_page_render_old_markdown_does_not_reuse(self):
+        cfg = load_config(markdown_extensions=['abbr'])
+        fl = File('a.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        files = Files([fl])
+        pg = Page(None, fl, cfg)
+        pg.markdown = 'Text'
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md_cls:
+            pg.render(cfg, files)
+            pg.render(cfg, files)
+        self.assertEqual(md_cls.call_count, 2)
+
     def test_missing_page(self):
         cfg = load_config()
         fl = File('missing.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
@@ -796,6 +860,47 @@ class RelativePathExtensionTests(unittest.TestCase):
             content = content[3:-4]
         return content
 
+    def test_relative_link_resolved_once_for_pages_in_same_dir(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        fs = [
+            File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for f in ['sub/a.md', 'sub/b.md', 'other/c.md']
+        ]
+        fs[2].inclusion = InclusionLevel.EXCLUDED
+        files = Files(fs)
+        for file in fs[:2]:
+            pg = Page('Foo', file, cfg)
+            with mock.patch(
+                'mkdocs.structure.files.open', mock.mock_open(read_data='[c](../other/c.md#x)')
+            ):
+                pg.read_source(cfg)
+            with self.assertLogs('mkdocs.structure.pages') as cm:
+                pg.render(cfg, files)
+            # Each page still reports its own link and registers its own anchors.
+            self.assertEqual(
+                [r.getMessage() for r in cm.records],
+                [
+                    (
+                        f"Doc file '{file.src_uri}' contains a link to 'other/c.md' "
+                        "which is excluded from the built site."
+                    )
+                ],
+            )
+            self.assertEqual(pg.content, '<p><a href="../../other/c/#x">c</a></p>')
+            self.assertEqual(pg.links_to_anchors, {fs[2]: {'x': '../other/c.md#x'}})
+            self.assertEqual(set(pg._link_targets), {'other/c.md'})
+
+        # After the target is removed, the link isn't resolved anymore.
+        files.remove(fs[2])
+        pg = Page('Foo', fs[0], cfg)
+        with mock.patch(
+            'mkdocs.structure.files.open', mock.mock_open(read_data='[c](../other/c.md#x)')
+        ):
+            pg.read_source(cfg)
+        with self.assertLogs('mkdocs.structure.pages'):
+            pg.render(cfg, files)
+        self.assertEqual(pg.content, '<p><a href="../other/c.md#x">c</a></p>')
+
     def test_relative_html_link(self):
         self.assertEqual(
             self.get_rendered_result(
@@ -2,15 +2,18 @@ import os
 import unittest
 from unittest import mock
 
+import jinja2
+
 import mkdocs
 from mkdocs.localization import parse_locale
 from mkdocs.tests.base import tempdir
-from mkdocs.theme import Theme
+from mkdocs.theme import Theme, _BytecodeCache
 
 abs_path = os.path.abspath(os.path.dirname(__file__))
 mkdocs_dir = os.path.abspath(os.path.dirname(mkdocs.__file__))
 mkdocs_templates_dir = os.path.join(mkdocs_dir, 'templates')
 theme_dir = os.path.abspath(os.path.join(mkdocs_dir, 'themes'))
+jinja2_compile = jinja2.Environment.compile
 
 
 class ThemeTests(unittest.TestCase):
@@ -123,3 +126,50 @@ class ThemeTests(unittest.TestCase):
                     'locale': parse_locale('en'),
                 },
             )
+
+    @tempdir(files={'foo.html': '{{ 1 + 1 }}'})
+    def test_get_env_reuses_compiled_templates(self, custom):
+        theme = Theme(name=None, custom_dir=custom)
+        with mock.patch.object(jinja2.Environment, 'compile', autospec=True) as m:
+            m.side_effect = jinja2_compile
+            self.assertEqual(theme.get_env().get_template('foo.html').render(), '2')
+            self.assertEqual(theme.get_env().get_template('foo.html').render(), '2')
+            self.assertEqual(m.call_count, 1)
+
+            # A change of the template or of the environment's syntax requires compiling again.
+            with open(os.path.join(custom, 'foo.html'), 'w') as f:
+                f.write('{{ 2 + 2 }}')
+            self.assertEqual(theme.get_env().get_template('foo.html').render(), '4')
+            env = theme.get_env()
+            env.variable_start_string, env.variable_end_string = '[[', ']]'
+            self.assertEqual(env.get_template('foo.html').render(), '{{ 2 + 2 }}')
+            self.assertEqual(m.call_count, 3)
+
+    @tempdir(files={'foo.html': '{{ 1 + 1 }}'})
+    def test_get_env_finalize_requires_compiling(self, custom):
+        theme = Theme(name=None, custom_dir=custom)
+        self.assertEqual(theme.get_env().get_template('foo.html').render(), '2')
+        env = theme.get_env()
+        env.finalize = lambda value: value * 2
+        self.assertEqual(env.get_template('foo.html').render(), '4')
+        env = theme.get_env()
+        env.code_generator_class = type('CodeGenerator', (jinja2.compiler.CodeGenerator,), {})
+        with mock.patch.object(jinja2.Environment, 'compile', autospec=True) as m:
+            m.side_effect = jinja2_compile
+            self.assertEqual(env.get_template('foo.html').render(), '2')
+            self.assertEqual(m.call_count, 1)
+
+    @tempdir(files={'foo.html': '{{ 1 + 1 }}'})
+    @tempdir()
+    def test_get_env_with_cache_dir(self, cache_dir, custom):
+        theme = Theme(name=None, custom_dir=custom)
+        self.assertEqual(theme.get_env(cache_dir=cache_dir).get_template('foo.html').render(), '2')
+        self.assertTrue(os.listdir(os.path.join(cache_dir, 'templates')))
+
+        # As in a new process.
+        with mock.patch.object(_BytecodeCache, '_instances', {}), mock.patch.object(
+            jinja2.Environment, 'compile', autospec=True
+        ) as m:
+            env = theme.get_env(cache_dir=cache_dir)
+            self.assertEqual(env.get_template('foo.html').render(), '2')
+            m.assert_not_called()
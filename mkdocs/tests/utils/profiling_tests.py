@@ -0,0 +1,57 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+from mkdocs.tests.base import tempdir
+from mkdocs.utils.profiling import Profiler
+
+
+class ProfilerTests(unittest.TestCase):
+    @mock.patch('time.perf_counter', side_effect=[1.0, 1.5, 1.5, 2.0, 3.5, 3.75])
+    def test_report(self, mock_perf_counter):
+        profiler = Profiler()
+        profiler.start_phase('files')
+        profiler.start_phase('pages')
+        with profiler.step('a.md', 'markdown'):
+            pass
+        profiler.add_step('b.md', 'markdown', 2.0, 2.1, 123)
+        profiler.add_step('c.md', 'markdown', 2.0, 2.5, 123)
+        profiler.end_phase()
+
+        report = profiler.format_report(top=2).splitlines()
+        self.assertEqual(
+            [line.split() for line in report[:4]],
+            [
+                ['Phase', 'Seconds'],
+                ['files', '0.500'],
+                ['pages', '2.250'],
+                ['Total', '2.750'],
+            ],
+        )
+        self.assertEqual([line.split()[-1] for line in report[5:]], ['Seconds', '1.500', '0.500'])
+        self.assertEqual([line.split()[0] for line in report[6:]], ['a.md', 'c.md'])
+
+    @tempdir()
+    def test_write_trace(self, tdir):
+        profiler = Profiler()
+        profiler.start_phase('files')
+        profiler.end_phase()
+        start = profiler.phases[0].start
+        profiler.add_step('a.md', 'template', start + 0.5, start + 0.75, 123)
+
+        path = os.path.join(tdir, 'trace.json')
+        profiler.write_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual(
+            [(e['name'], e['cat'], e['ph']) for e in events],
+            [
+                ('files', 'phase', 'X'),
+                ('a.md', 'template', 'X'),
+            ],
+        )
+        self.assertEqual(events[0]['ts'], 0)
+        self.assertEqual(
+            (events[1]['ts'], events[1]['dur'], events[1]['tid']), (500000, 250000, 123)
+        )
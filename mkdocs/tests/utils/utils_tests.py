@@ -5,6 +5,7 @@ import datetime
 import logging
 import os
 import posixpath
+import shutil
 import stat
 import unittest
 from unittest import mock
@@ -361,6 +362,89 @@ class UtilsTests(unittest.TestCase):
                 if os.path.exists(src):
                     os.chmod(src, stat.S_IRUSR | stat.S_IWUSR)
 
+    @tempdir(files={'src.txt': 'content', 'dst/src.txt': 'old'})
+    def test_copy_file_strategies(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        os.utime(src, ns=(0, 10**9))
+        for strategy in 'copy', 'reflink', 'hardlink':
+            with self.subTest(strategy):
+                dst = os.path.join(tdir, strategy, 'src.txt')
+                self.assertTrue(utils.copy_file(src, dst, strategy=strategy))
+                with open(dst) as f:
+                    self.assertEqual(f.read(), 'content')
+                self.assertEqual(os.stat(dst).st_mtime_ns == 10**9, strategy == 'hardlink')
+                self.assertEqual(os.path.samefile(src, dst), strategy == 'hardlink')
+
+                dst = os.path.join(tdir, strategy, 'skip', 'src.txt')
+                with mock.patch('os.utime', wraps=os.utime) as mock_utime:
+                    self.assertTrue(
+                        utils.copy_file(src, dst, strategy=strategy, skip_unchanged=True)
+                    )
+                self.assertEqual(os.stat(dst).st_mtime_ns, 10**9)
+                # The times of a hard link are the source's own, they're left alone.
+                self.assertEqual(mock_utime.called, strategy != 'hardlink')
+
+        # An existing file is replaced rather than written to.
+        dst_dir = os.path.join(tdir, 'dst')
+        os.link(os.path.join(dst_dir, 'src.txt'), os.path.join(tdir, 'other.txt'))
+        self.assertTrue(utils.copy_file(src, dst_dir, strategy='hardlink'))
+        self.assertTrue(os.path.samefile(src, os.path.join(dst_dir, 'src.txt')))
+        with open(os.path.join(tdir, 'other.txt')) as f:
+            self.assertEqual(f.read(), 'old')
+
+    @tempdir(files={'src.txt': 'content', 'same.txt': 'CONTENT', 'longer.txt': 'contents'})
+    def test_copy_file_skip_unchanged(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        os.utime(src, ns=(0, 10**9))
+        for name in 'same.txt', 'longer.txt':
+            with self.subTest(name):
+                dst = os.path.join(tdir, name)
+                os.utime(dst, ns=(0, 10**9))
+                copied = utils.copy_file(src, dst, skip_unchanged=True)
+                self.assertEqual(copied, name != 'same.txt')
+                with open(dst) as f:
+                    self.assertEqual(f.read(), 'CONTENT' if name == 'same.txt' else 'content')
+
+        self.assertFalse(utils.copy_file(src, src, strategy='hardlink', skip_unchanged=True))
+        with self.assertRaises(shutil.SameFileError):
+            utils.copy_file(src, src, strategy='hardlink')
+        with open(src) as f:
+            self.assertEqual(f.read(), 'content')
+
+    @tempdir(files={'same.html': 'content', 'other.html': 'CONTENT', 'longer.html': 'contents'})
+    def test_write_file_skip_unchanged(self, tdir):
+        for name in 'same.html', 'other.html', 'longer.html', 'new/new.html':
+            with self.subTest(name):
+                path = os.path.join(tdir, name)
+                if os.path.exists(path):
+                    os.utime(path, ns=(0, 0))
+                written = utils.write_file(b'content', path, skip_unchanged=True)
+                self.assertEqual(written, name != 'same.html')
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), b'content')
+                self.assertEqual(os.stat(path).st_mtime_ns == 0, name == 'same.html')
+
+        path = os.path.join(tdir, 'same.html')
+        self.assertTrue(utils.write_file(b'content', path))
+        self.assertNotEqual(os.stat(path).st_mtime_ns, 0)
+
+    @tempdir(files={'same.html': 'content'})
+    def test_write_file_chunks(self, tdir):
+        path = os.path.join(tdir, 'new', 'new.html')
+        self.assertTrue(utils.write_file(iter([b'con', b'tent']), path))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'content')
+
+        path = os.path.join(tdir, 'same.html')
+        os.utime(path, ns=(0, 0))
+        self.assertFalse(utils.write_file(iter([b'con', b'tent']), path, skip_unchanged=True))
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        for chunks in [b'con', b'tents'], [b'con', b'TENT', b'!'], [b'cont'], [b'', b'c']:
+            with self.subTest(chunks=chunks):
+                self.assertTrue(utils.write_file(iter(chunks), path, skip_unchanged=True))
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), b''.join(chunks))
+
     def test_mm_meta_data(self):
         doc = dedent(
             """
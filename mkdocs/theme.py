@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import logging
 import os
+import tempfile
 import warnings
-from typing import Any, Collection, MutableMapping
+from typing import TYPE_CHECKING, Any, Collection, MutableMapping
 
 import jinja2
 import yaml
@@ -17,6 +18,9 @@ from mkdocs import localization, utils
 from mkdocs.config.base import ValidationError
 from mkdocs.utils import templates
 
+if TYPE_CHECKING:
+    from types import CodeType
+
 log = logging.getLogger(__name__)
 
 
@@ -155,12 +159,117 @@ class Theme(MutableMapping[str, Any]):
         self.static_templates.update(theme_config.pop('static_templates', []))
         self.__vars.update(theme_config)
 
-    def get_env(self) -> jinja2.Environment:
-        """Return a Jinja environment for the theme."""
+    def get_env(self, *, cache_dir: str | None = None) -> jinja2.Environment:
+        """
+        Return a Jinja environment for the theme.
+
+        Compiled templates are reused by the environments of later builds in this process,
+        and also stored in `cache_dir` if it's given.
+        """
         loader = jinja2.FileSystemLoader(self.dirs)
         # No autoreload because editing a template in the middle of a build is not useful.
-        env = jinja2.Environment(loader=loader, auto_reload=False)
+        env = jinja2.Environment(
+            loader=loader, auto_reload=False, bytecode_cache=_BytecodeCache.get(cache_dir)
+        )
         env.filters['url'] = templates.url_filter
         env.filters['script_tag'] = templates.script_tag_filter
         localization.install_translations(env, self.locale, self.dirs)
         return env
+
+
+def _qualified_name(obj: object) -> object:
+    """A name for a function or class that stays the same between processes."""
+    if not callable(obj):
+        return obj
+    return (
+        getattr(obj, '__module__', None),
+        getattr(obj, '__qualname__', type(obj).__qualname__),
+        # Set by `jinja2.pass_context` and friends, it changes how the function is called.
+        getattr(obj, 'jinja_pass_arg', None),
+    )
+
+
+def _environment_key(env: jinja2.Environment) -> str:
+    """The settings of the environment that affect how a template is compiled."""
+    return repr(
+        (
+            sorted(env.extensions),
+            env.block_start_string,
+            env.block_end_string,
+            env.variable_start_string,
+            env.variable_end_string,
+            env.comment_start_string,
+            env.comment_end_string,
+            env.line_statement_prefix,
+            env.line_comment_prefix,
+            env.trim_blocks,
+            env.lstrip_blocks,
+            env.newline_sequence,
+            env.keep_trailing_newline,
+            env.optimized,
+            _qualified_name(env.autoescape),
+            _qualified_name(env.finalize),
+            _qualified_name(env.code_generator_class),
+            _qualified_name(env.context_class),
+            env.is_async,
+        )
+    )
+
+
+class _BytecodeCache(jinja2.BytecodeCache):
+    """
+    Keeps compiled templates in memory, and in `directory` if it's given.
+
+    Jinja only checks that the source of a template didn't change, but plugins can also change
+    the extensions or syntax of the environment (`on_env`), so they are part of the checksum.
+    """
+
+    _instances: dict[str | None, _BytecodeCache] = {}
+
+    @classmethod
+    def get(cls, cache_dir: str | None) -> _BytecodeCache:
+        """The cache that is shared by all environments that use this `cache_dir`."""
+        cache = cls._instances.get(cache_dir)
+        if cache is None:
+            cache = cls._instances[cache_dir] = cls(cache_dir)
+        return cache
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        self.directory = os.path.join(cache_dir, 'templates') if cache_dir else None
+        self._code: dict[str, tuple[str, CodeType]] = {}
+
+    def get_bucket(
+        self, environment: jinja2.Environment, name: str, filename: str | None, source: str
+    ) -> jinja2.bccache.Bucket:
+        source = _environment_key(environment) + '\n' + source
+        return super().get_bucket(environment, name, filename, source)
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        entry = self._code.get(bucket.key)
+        if entry is not None:
+            if entry[0] == bucket.checksum:
+                bucket.code = entry[1]
+            return
+        if self.directory is None:
+            return
+        try:
+            with open(os.path.join(self.directory, f'{bucket.key}.cache'), 'rb') as f:
+                bucket.load_bytecode(f)
+        except Exception:  # Missing, or written by a different version of Python.
+            bucket.reset()
+        if bucket.code is not None:
+            self._code[bucket.key] = (bucket.checksum, bucket.code)
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        assert bucket.code is not None
+        self._code[bucket.key] = (bucket.checksum, bucket.code)
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, as worker processes may store the same template.
+            with tempfile.NamedTemporaryFile('wb', dir=self.directory, delete=False) as f:
+                bucket.write_bytecode(f)
+            os.replace(f.name, os.path.join(self.directory, f'{bucket.key}.cache'))
+        except OSError as e:
+            log.debug(f"Couldn't save the compiled template: {e}")
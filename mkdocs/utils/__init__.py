@@ -13,14 +13,28 @@ import os
 import posixpath
 import re
 import shutil
+import stat
 import sys
 import warnings
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import PurePath
-from typing import TYPE_CHECKING, Collection, Iterable, MutableSequence, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Collection,
+    Iterable,
+    Iterator,
+    MutableSequence,
+    TypeVar,
+)
 from urllib.parse import urlsplit
 
+if sys.platform == 'linux':
+    import fcntl
+
+    _FICLONE = 0x40049409  # From <linux/fs.h>, not exposed by the `fcntl` module.
+
 if sys.version_info >= (3, 10):
     from importlib.metadata import EntryPoint, entry_points
 else:
@@ -111,25 +125,153 @@ else:
         a.insert(i, x)
 
 
-def copy_file(source_path: str, output_path: str) -> None:
+def copy_file(
+    source_path: str, output_path: str, *, strategy: str = 'copy', skip_unchanged: bool = False
+) -> bool:
     """
     Copy source_path to output_path, making sure any parent directories exist.
 
     The output_path may be a directory.
-    """
-    output_dir = os.path.dirname(output_path)
-    os.makedirs(output_dir, exist_ok=True)
-    if os.path.isdir(output_path):
-        output_path = os.path.join(output_path, os.path.basename(source_path))
-    shutil.copyfile(source_path, output_path)
 
+    The `strategy` may be 'copy', 'reflink' (a copy-on-write clone where the file system supports
+    it) or 'hardlink' (falling back to 'reflink', e.g. across file systems); both fall back to a
+    regular copy. With `skip_unchanged`, the modification time of the source is preserved, and a
+    file with the same size and modification time as the source is left untouched. Returns whether
+    the file was copied.
+    """
+    source_stat = os.stat(source_path)
+    try:
+        output_stat = os.stat(output_path)
+        if stat.S_ISDIR(output_stat.st_mode):
+            output_path = os.path.join(output_path, os.path.basename(source_path))
+            output_stat = os.stat(output_path)
+    except OSError:
+        output_stat = None
+    if output_stat is not None:
+        if skip_unchanged and (output_stat.st_size, output_stat.st_mtime_ns) == (
+            source_stat.st_size,
+            source_stat.st_mtime_ns,
+        ):
+            return False
+        if strategy != 'copy':
+            if os.path.samestat(source_stat, output_stat):
+                raise shutil.SameFileError(f"{source_path!r} and {output_path!r} are the same file")
+            # Never write through the destination, it may be a link to some other file.
+            os.unlink(output_path)
+
+    try:
+        linked = _copy_file(source_path, output_path, strategy)
+    except FileNotFoundError:
+        # Only create the parent directories once copying has failed, to save the system calls
+        # for the many files that are copied into directories which already exist.
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if os.path.isdir(output_path):
+            output_path = os.path.join(output_path, os.path.basename(source_path))
+        linked = _copy_file(source_path, output_path, strategy)
+    # A hard link already shares the source's times, and setting them would touch the source.
+    if skip_unchanged and not linked:
+        os.utime(output_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return True
+
+
+def _copy_file(source_path: str, output_path: str, strategy: str) -> bool:
+    """Return whether output_path was hard-linked to source_path."""
+    if strategy == 'hardlink' and _link_file(source_path, output_path):
+        return True
+    if strategy == 'copy' or not _clone_file(source_path, output_path):
+        shutil.copyfile(source_path, output_path)
+    return False
+
+
+def _link_file(source_path: str, output_path: str) -> bool:
+    try:
+        os.link(source_path, output_path)
+    except OSError:
+        return False
+    return True
+
+
+def _clone_file(source_path: str, output_path: str) -> bool:
+    """Try to clone the file, or else to copy it within the kernel without reading it."""
+    if sys.platform != 'linux':
+        return False
+    with open(source_path, 'rb') as src, open(output_path, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            pass
+        else:
+            return True
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if not copied:
+                    return False
+                remaining -= copied
+        except OSError:
+            return False
+    return True
+
+
+def write_file(
+    content: bytes | Iterable[bytes], output_path: str, *, skip_unchanged: bool = False
+) -> bool:
+    """
+    Write content to output_path, making sure any parent directories exist.
 
-def write_file(content: bytes, output_path: str) -> None:
-    """Write content to output_path, making sure any parent directories exist."""
+    The content can also be an iterable of chunks, which are written as they are produced.
+    With `skip_unchanged`, a file that already has exactly this content is left untouched, which
+    preserves its modification time. Returns whether the file was written.
+    """
+    if isinstance(content, bytes):
+        if skip_unchanged and _has_content(output_path, content):
+            return False
+        content = (content,)
+    elif skip_unchanged:
+        try:
+            existing = open(output_path, 'r+b')
+        except OSError:
+            pass
+        else:
+            with existing:
+                return _update_file(existing, iter(content))
     output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
     with open(output_path, 'wb') as f:
-        f.write(content)
+        f.writelines(content)
+    return True
+
+
+def _update_file(f: BinaryIO, chunks: Iterator[bytes]) -> bool:
+    """
+    Compare the chunks with the content of the file as they are produced, and only write them
+    from the first difference on. Returns whether the file was changed.
+    """
+    offset = 0
+    for chunk in chunks:
+        if f.read(len(chunk)) != chunk:
+            f.seek(offset)
+            f.write(chunk)
+            f.writelines(chunks)
+            f.truncate()
+            return True
+        offset += len(chunk)
+    if f.read(1):
+        f.truncate(offset)
+        return True
+    return False
+
+
+def _has_content(path: str, content: bytes) -> bool:
+    try:
+        # Comparing the sizes first avoids reading most of the files that did change.
+        if os.path.getsize(path) != len(content):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == content
+    except OSError:
+        return False
 
 
 def clean_directory(directory: str) -> None:
@@ -386,6 +528,33 @@ class CountHandler(logging.NullHandler):
         return [(logging.getLevelName(k), v) for k, v in sorted(self.counts.items(), reverse=True)]
 
 
+class CaptureHandler(logging.Handler):
+    """Collects all logged messages >= level, so that they can be replayed later (possibly in another process)."""
+
+    def __init__(self, **kwargs) -> None:
+        self.records: list[logging.LogRecord] = []
+        super().__init__(**kwargs)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Pre-format the message so that the record stays picklable.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    def pop_records(self) -> list[logging.LogRecord]:
+        records, self.records = self.records, []
+        return records
+
+
+def replay_log_records(records: Iterable[logging.LogRecord]) -> None:
+    """Re-emit records collected by `CaptureHandler` through the loggers they were originally sent to."""
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
 class weak_property:
     """Same as a read-only property, but allows overwriting the field for good."""
 
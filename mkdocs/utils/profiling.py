@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+from typing import Iterator, NamedTuple
+
+
+class Span(NamedTuple):
+    name: str
+    category: str
+    start: float
+    """`time.perf_counter()` at the start. On Linux this clock is shared by all processes."""
+    end: float
+    pid: int
+
+
+class Profiler:
+    """
+    Records how long each phase of a build takes, as well as the steps for each page.
+
+    Phases follow each other: starting a phase ends the previous one.
+    """
+
+    def __init__(self) -> None:
+        self.phases: list[Span] = []
+        self.steps: list[Span] = []
+        self._phase: tuple[str, float] | None = None
+
+    def start_phase(self, name: str) -> None:
+        self.end_phase()
+        self._phase = (name, time.perf_counter())
+
+    def end_phase(self) -> None:
+        if self._phase is not None:
+            name, start = self._phase
+            self.phases.append(Span(name, 'phase', start, time.perf_counter(), os.getpid()))
+            self._phase = None
+
+    def add_step(self, name: str, category: str, start: float, end: float, pid: int) -> None:
+        """Record a step such as rendering the Markdown of the page `name`."""
+        self.steps.append(Span(name, category, start, end, pid))
+
+    @contextlib.contextmanager
+    def step(self, name: str, category: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_step(name, category, start, time.perf_counter(), os.getpid())
+
+    def format_report(self, top: int = 10) -> str:
+        """A table of the duration of each phase, followed by the slowest steps of each category."""
+        lines = [f"{'Phase':<50} {'Seconds':>8}"]
+        for span in self.phases:
+            lines.append(f"{span.name:<50} {span.end - span.start:>8.3f}")
+        if self.phases:
+            total = self.phases[-1].end - self.phases[0].start
+            lines.append(f"{'Total':<50} {total:>8.3f}")
+
+        categories: dict[str, list[Span]] = {}
+        for span in self.steps:
+            categories.setdefault(span.category, []).append(span)
+        for category, spans in categories.items():
+            spans.sort(key=lambda span: span.end - span.start, reverse=True)
+            lines.append('')
+            lines.append(f"{f'Slowest pages: {category}':<50} {'Seconds':>8}")
+            for span in spans[:top]:
+                lines.append(f"{span.name:<50} {span.end - span.start:>8.3f}")
+        return '\n'.join(lines)
+
+    def write_trace(self, path: str) -> None:
+        """Write the phases and steps in the Trace Event Format of Chrome's `about:tracing`."""
+        main_pid = os.getpid()
+        origin = self.phases[0].start if self.phases else 0
+        events = [
+            {
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round((span.start - origin) * 1e6),
+                'dur': round((span.end - span.start) * 1e6),
+                'pid': main_pid,
+                # Show each worker process as a separate thread of the build.
+                'tid': span.pid,
+            }
+            for span in self.phases + self.steps
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)